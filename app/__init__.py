@@ -6,6 +6,7 @@ app/__init__.py
 from flask import Flask, render_template
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
+from flask_caching import Cache
 from flask_login import LoginManager
 from config import config
 
@@ -13,17 +14,24 @@ from config import config
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 login_manager = LoginManager()
+cache = Cache()
 
 def create_app(config_name='development'):
     """Factory pattern para crear la aplicación Flask"""
     
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    config[config_name].init_app(app)
+
+    # Serialización JSON con orjson (C) en lugar del json de la stdlib
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
     
     # Inicializar extensiones
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
+    cache.init_app(app)
     
     # Configuración de Flask-Login
     login_manager.login_view = 'auth.login'
@@ -45,6 +53,14 @@ def create_app(config_name='development'):
     # Registrar filtros personalizados
     from app.utils import filters
     filters.register_filters(app)
+
+    # Iniciar el buffer de log de actividad (escritura diferida en lotes)
+    from app.utils import log_buffer
+    log_buffer.iniciar(app)
+
+    # Iniciar el precálculo en segundo plano de estadísticas del dashboard
+    from app.utils import precalculo
+    precalculo.iniciar(app)
     
     # Manejadores de errores
     @app.errorhandler(404)
@@ -9,6 +9,7 @@ from app.models.cuenta import Cuenta
 from app.models.transaccion import Transaccion
 from app.models.presupuesto import Presupuesto
 from app.models.meta_ahorro import MetaAhorro, AporteMeta
+from app.models.saldo_mensual import SaldoMensual
 from app.models.otros import ConsejoFinanciero, Sesion, LogActividad, EstadisticaApp
 
 __all__ = [
@@ -20,6 +21,7 @@ __all__ = [
     'Presupuesto',
     'MetaAhorro',
     'AporteMeta',
+    'SaldoMensual',
     'ConsejoFinanciero',
     'Sesion',
     'LogActividad',
@@ -220,7 +220,29 @@ class LogActividad(db.Model):
         db.session.add(log)
         db.session.commit()
         return log
-    
+
+    @staticmethod
+    def registrar_diferido(usuario_id, accion, detalle=None, ip_address=None):
+        """
+        Registra una actividad de forma diferida (fire-and-forget)
+
+        Encola el evento en el buffer en memoria; un hilo de fondo lo
+        inserta en lote, sin costo de commit en el camino de la petición.
+
+        Args:
+            usuario_id (int): ID del usuario
+            accion (str): Acción realizada
+            detalle (str): Detalles adicionales
+            ip_address (str): Dirección IP
+        """
+        from app.utils import log_buffer
+        log_buffer.encolar(
+            usuario_id=usuario_id,
+            accion=accion,
+            detalle=detalle,
+            ip_address=ip_address
+        )
+
     @staticmethod
     def get_actividad_reciente(usuario_id=None, limite=50):
         """
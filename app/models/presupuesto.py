@@ -36,13 +36,20 @@ class Presupuesto(db.Model):
     def get_monto_gastado(self):
         """
         Calcula el monto gastado en este presupuesto
-        
+
+        Si el presupuesto fue cargado vía get_presupuestos_activos, el
+        gasto ya viene anotado por la consulta agrupada y se reutiliza
+        sin emitir una consulta adicional por presupuesto.
+
         Returns:
             float: Monto gastado
         """
         from sqlalchemy import func
         from app.models.transaccion import Transaccion
-        
+
+        if getattr(self, '_monto_gastado_cache', None) is not None:
+            return self._monto_gastado_cache
+
         resultado = db.session.query(func.sum(Transaccion.monto)).filter(
             Transaccion.usuario_id == self.usuario_id,
             Transaccion.categoria_id == self.categoria_id,
@@ -185,12 +192,42 @@ class Presupuesto(db.Model):
         Returns:
             list: Lista de presupuestos activos
         """
+        from sqlalchemy import func
+        from sqlalchemy.orm import selectinload
+        from app.models.transaccion import Transaccion
+
         hoy = datetime.now().date()
-        return Presupuesto.query.filter(
+
+        # Una sola consulta agrupada: cada presupuesto llega con su gasto
+        # ya sumado, evitando un SUM por presupuesto al evaluar alertas.
+        # selectinload trae las categorías en una segunda consulta única en
+        # lugar de un SELECT por presupuesto al renderizar nombre/color
+        filas = db.session.query(
+            Presupuesto,
+            func.coalesce(func.sum(Transaccion.monto), 0).label('gastado')
+        ).options(
+            selectinload(Presupuesto.categoria)
+        ).outerjoin(
+            Transaccion,
+            db.and_(
+                Transaccion.usuario_id == Presupuesto.usuario_id,
+                Transaccion.categoria_id == Presupuesto.categoria_id,
+                Transaccion.tipo == 'egreso',
+                Transaccion.fecha_transaccion >= Presupuesto.fecha_inicio,
+                Transaccion.fecha_transaccion <= Presupuesto.fecha_fin
+            )
+        ).filter(
             Presupuesto.usuario_id == usuario_id,
             Presupuesto.fecha_inicio <= hoy,
             Presupuesto.fecha_fin >= hoy
-        ).all()
+        ).group_by(Presupuesto.id).all()
+
+        presupuestos = []
+        for presupuesto, gastado in filas:
+            presupuesto._monto_gastado_cache = float(gastado)
+            presupuestos.append(presupuesto)
+
+        return presupuestos
     
     @staticmethod
     def get_presupuestos_en_alerta(usuario_id):
@@ -207,4 +244,22 @@ class Presupuesto(db.Model):
         return [p for p in presupuestos if p.esta_en_alerta()]
     
     def __repr__(self):
-        return f'<Presupuesto {self.categoria.nombre if self.categoria else "N/A"} - ${self.monto_limite}>'
\ No newline at end of file
+        return f'<Presupuesto {self.categoria.nombre if self.categoria else "N/A"} - ${self.monto_limite}>'
+
+# ==========================================
+# EVENT LISTENERS
+# ==========================================
+
+from sqlalchemy import event
+from app.utils.cache_utils import invalidar_estadisticas_usuario
+
+
+@event.listens_for(Presupuesto, 'after_insert')
+@event.listens_for(Presupuesto, 'after_update')
+@event.listens_for(Presupuesto, 'after_delete')
+def invalidar_cache_presupuesto(mapper, connection, target):
+    """
+    Invalida las respuestas cacheadas que dependen de presupuestos
+    (por ejemplo el análisis de salud financiera)
+    """
+    invalidar_estadisticas_usuario(target.usuario_id)
@@ -0,0 +1,256 @@
+"""
+Modelo de Saldo Mensual
+app/models/saldo_mensual.py
+
+Tabla agregada que materializa los totales mensuales por usuario, tipo y
+categoría. Se mantiene incrementalmente desde los event listeners de
+Transaccion, de modo que el dashboard y los resúmenes mensuales leen
+totales precalculados en lugar de volver a sumar la tabla de
+transacciones en cada petición.
+"""
+
+from app import db
+from decimal import Decimal
+from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+
+class SaldoMensual(db.Model):
+    """
+    Agregado mensual por (usuario, año, mes, categoría, tipo)
+
+    Cada fila acumula el total y la cantidad de transacciones de un
+    usuario en un mes para una categoría. Las filas se crean/actualizan
+    vía upsert desde los listeners de Transaccion (mantenimiento
+    incremental de vista). recalcular_usuario permite reconstruir o
+    auditar los agregados desde la tabla base.
+    """
+
+    __tablename__ = 'saldo_mensual'
+
+    id = db.Column(db.Integer, primary_key=True)
+    usuario_id = db.Column(
+        db.Integer,
+        db.ForeignKey('usuarios.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    anio = db.Column(db.Integer, nullable=False)
+    mes = db.Column(db.Integer, nullable=False)
+    categoria_id = db.Column(
+        db.Integer,
+        db.ForeignKey('categorias.id', ondelete='CASCADE'),
+        nullable=False
+    )
+    tipo = db.Column(
+        db.Enum('ingreso', 'egreso', name='tipo_transaccion_enum'),
+        nullable=False
+    )
+    total = db.Column(db.Numeric(15, 2), nullable=False, default=0.00)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('usuario_id', 'anio', 'mes', 'categoria_id', 'tipo',
+                            name='uq_saldo_mensual_usuario_periodo'),
+    )
+
+    @staticmethod
+    def aplicar_delta(connection, usuario_id, fecha, tipo, categoria_id, delta, delta_cantidad):
+        """
+        Aplica un delta al agregado mensual correspondiente (upsert)
+
+        Args:
+            connection: Conexión activa (la del listener)
+            usuario_id (int): ID del usuario
+            fecha (date): Fecha de la transacción
+            tipo (str): 'ingreso' o 'egreso'
+            categoria_id (int): ID de la categoría
+            delta (Decimal): Monto a sumar (puede ser negativo)
+            delta_cantidad (int): Transacciones a sumar (+1 / -1 / 0)
+        """
+        tabla = SaldoMensual.__table__
+        stmt = mysql_insert(tabla).values(
+            usuario_id=usuario_id,
+            anio=fecha.year,
+            mes=fecha.month,
+            categoria_id=categoria_id,
+            tipo=tipo,
+            total=delta,
+            cantidad=max(delta_cantidad, 0)
+        )
+        stmt = stmt.on_duplicate_key_update(
+            total=tabla.c.total + delta,
+            cantidad=tabla.c.cantidad + delta_cantidad
+        )
+        connection.execute(stmt)
+
+    @staticmethod
+    def reconstruir_en_conexion(connection, usuario_id):
+        """
+        Reconstruye los agregados de un usuario sobre una conexión dada
+
+        Variante de recalcular_usuario apta para event listeners: opera
+        con sentencias Core (DELETE + INSERT ... SELECT) sobre la
+        conexión del flush, sin pasar por la sesión.
+
+        Args:
+            connection: Conexión activa (la del listener)
+            usuario_id (int): ID del usuario
+        """
+        from app.models.transaccion import Transaccion
+
+        tabla = SaldoMensual.__table__
+        connection.execute(
+            db.delete(tabla).where(tabla.c.usuario_id == usuario_id)
+        )
+
+        anio = func.extract('year', Transaccion.fecha_transaccion)
+        mes = func.extract('month', Transaccion.fecha_transaccion)
+
+        seleccion = db.select(
+            Transaccion.usuario_id,
+            anio,
+            mes,
+            Transaccion.categoria_id,
+            Transaccion.tipo,
+            func.sum(Transaccion.monto),
+            func.count(Transaccion.id)
+        ).where(
+            Transaccion.usuario_id == usuario_id
+        ).group_by(
+            anio, mes, Transaccion.categoria_id, Transaccion.tipo
+        )
+
+        connection.execute(tabla.insert().from_select(
+            ['usuario_id', 'anio', 'mes', 'categoria_id', 'tipo', 'total', 'cantidad'],
+            seleccion
+        ))
+
+    @staticmethod
+    def obtener_total(usuario_id, anio, mes, tipo):
+        """
+        Obtiene el total acumulado de un mes sobre el agregado
+
+        Args:
+            usuario_id (int): ID del usuario
+            anio (int): Año
+            mes (int): Mes (1-12)
+            tipo (str): 'ingreso' o 'egreso'
+
+        Returns:
+            Decimal: Total del mes (0.00 si no hay registros)
+        """
+        resultado = db.session.query(func.sum(SaldoMensual.total)).filter_by(
+            usuario_id=usuario_id,
+            anio=anio,
+            mes=mes,
+            tipo=tipo
+        ).scalar()
+
+        return resultado if resultado is not None else Decimal('0.00')
+
+    @staticmethod
+    def obtener_cantidad(usuario_id, anio, mes, tipo=None):
+        """
+        Obtiene la cantidad de transacciones de un mes sobre el agregado
+
+        Args:
+            usuario_id (int): ID del usuario
+            anio (int): Año
+            mes (int): Mes (1-12)
+            tipo (str): 'ingreso' o 'egreso' (opcional)
+
+        Returns:
+            int: Número de transacciones del mes
+        """
+        query = db.session.query(func.sum(SaldoMensual.cantidad)).filter_by(
+            usuario_id=usuario_id,
+            anio=anio,
+            mes=mes
+        )
+
+        if tipo:
+            query = query.filter_by(tipo=tipo)
+
+        resultado = query.scalar()
+        return int(resultado) if resultado is not None else 0
+
+    @staticmethod
+    def obtener_resumen_categorias(usuario_id, anio, mes, tipo=None):
+        """
+        Obtiene el resumen mensual agrupado por categoría desde el agregado
+
+        Mismo contrato que Transaccion.get_resumen_por_categoria pero sin
+        escanear la tabla base.
+
+        Args:
+            usuario_id (int): ID del usuario
+            anio (int): Año
+            mes (int): Mes (1-12)
+            tipo (str): 'ingreso' o 'egreso' (opcional)
+
+        Returns:
+            list: Lista de tuplas (categoria_nombre, categoria_color, total, cantidad)
+        """
+        from app.models.categoria import Categoria
+
+        query = db.session.query(
+            Categoria.nombre,
+            Categoria.color,
+            func.sum(SaldoMensual.total).label('total'),
+            func.sum(SaldoMensual.cantidad).label('cantidad')
+        ).join(
+            Categoria, Categoria.id == SaldoMensual.categoria_id
+        ).filter(
+            SaldoMensual.usuario_id == usuario_id,
+            SaldoMensual.anio == anio,
+            SaldoMensual.mes == mes
+        )
+
+        if tipo:
+            query = query.filter(SaldoMensual.tipo == tipo)
+
+        return query.group_by(Categoria.id).order_by(
+            func.sum(SaldoMensual.total).desc()
+        ).all()
+
+    @staticmethod
+    def recalcular_usuario(usuario_id):
+        """
+        Reconstruye los agregados de un usuario desde la tabla base
+
+        Útil para poblar la tabla en instalaciones existentes o como
+        auditoría si los agregados se desincronizan.
+
+        Args:
+            usuario_id (int): ID del usuario
+        """
+        from app.models.transaccion import Transaccion
+
+        SaldoMensual.query.filter_by(usuario_id=usuario_id).delete()
+
+        filas = db.session.query(
+            func.extract('year', Transaccion.fecha_transaccion).label('anio'),
+            func.extract('month', Transaccion.fecha_transaccion).label('mes'),
+            Transaccion.categoria_id,
+            Transaccion.tipo,
+            func.sum(Transaccion.monto).label('total'),
+            func.count(Transaccion.id).label('cantidad')
+        ).filter(
+            Transaccion.usuario_id == usuario_id
+        ).group_by('anio', 'mes', Transaccion.categoria_id, Transaccion.tipo).all()
+
+        for anio, mes, categoria_id, tipo, total, cantidad in filas:
+            db.session.add(SaldoMensual(
+                usuario_id=usuario_id,
+                anio=int(anio),
+                mes=int(mes),
+                categoria_id=categoria_id,
+                tipo=tipo,
+                total=total,
+                cantidad=cantidad
+            ))
+
+        db.session.commit()
+
+    def __repr__(self):
+        return f'<SaldoMensual usuario={self.usuario_id} {self.anio}-{self.mes:02d} {self.tipo}: {self.total}>'
@@ -73,7 +73,9 @@ class Transaccion(db.Model):
     fecha_transaccion = db.Column(db.Date, nullable=False, index=True)
     hora_transaccion = db.Column(db.Time, default=time(0, 0, 0))
     fecha_registro = db.Column(db.DateTime, default=datetime.utcnow)
-    fecha_modificacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Sellada por el servidor de BD en cada UPDATE, sin syscall de reloj
+    # ni datetime de Python en el camino del listener
+    fecha_modificacion = db.Column(db.DateTime, server_default=func.now(), onupdate=func.now())
     
     # ==========================================
     # TRANSACCIONES RECURRENTES
@@ -104,6 +106,26 @@ class Transaccion(db.Model):
     editada = db.Column(db.Boolean, default=False)
     num_ediciones = db.Column(db.Integer, default=0)
     
+    # ==========================================
+    # ÍNDICES
+    # ==========================================
+    __table_args__ = (
+        # Soporta la paginación keyset del API (usuario + id descendente)
+        db.Index('ix_tx_usuario_id_desc', usuario_id, id.desc()),
+        # Índices compuestos alineados a los patrones del dashboard:
+        # paginación por fecha/hora, filtros por tipo y por categoría
+        # dentro de un rango de fechas (evitan sort-after-scan)
+        db.Index('ix_tx_usuario_fecha_hora', usuario_id,
+                 fecha_transaccion.desc(), hora_transaccion.desc()),
+        db.Index('ix_tx_usuario_tipo_fecha', usuario_id, tipo, fecha_transaccion),
+        db.Index('ix_tx_usuario_cat_fecha', usuario_id, categoria_id, fecha_transaccion),
+        # Índice FULLTEXT para la búsqueda por descripción: un LIKE con
+        # comodín inicial obligaría a escanear toda la tabla
+        db.Index('ix_tx_descripcion_fulltext', descripcion, mysql_prefix='FULLTEXT'),
+        # La BD rechaza montos inválidos sin depender de validación en app
+        db.CheckConstraint('monto > 0', name='ck_tx_monto_positivo'),
+    )
+
     # ==========================================
     # RELACIONES
     # ==========================================
@@ -710,18 +732,31 @@ class Transaccion(db.Model):
     def buscar_transacciones(usuario_id, termino, limite=50):
         """
         Busca transacciones por término en descripción
-        
+
+        Usa el índice FULLTEXT de MySQL (MATCH ... AGAINST) en lugar de
+        ILIKE con comodín inicial, que no puede usar índices B-tree y
+        degenera en un escaneo completo de la tabla.
+
         Args:
             usuario_id (int): ID del usuario
             termino (str): Término de búsqueda
             limite (int): Número máximo de resultados
-            
+
         Returns:
             list: Lista de transacciones que coinciden
         """
+        import re
+
+        # Quitar operadores del modo booleano de MySQL y acotar el límite
+        termino_limpio = re.sub(r'[+\-><()~*"@]', ' ', termino).strip()
+        limite = min(limite, 100)
+
+        if not termino_limpio:
+            return []
+
         return Transaccion.query.filter(
             Transaccion.usuario_id == usuario_id,
-            Transaccion.descripcion.ilike(f'%{termino}%')
+            Transaccion.descripcion.match(termino_limpio)
         ).order_by(Transaccion.fecha_transaccion.desc()).limit(limite).all()
     
     @staticmethod
@@ -737,22 +772,15 @@ class Transaccion(db.Model):
         Returns:
             dict: Estadísticas del mes
         """
-        # Calcular fechas del mes
         from calendar import monthrange
-        primer_dia = date(anio, mes, 1)
-        ultimo_dia = date(anio, mes, monthrange(anio, mes)[1])
-        
-        # Totales
-        total_ingresos = Transaccion.get_total_por_tipo(usuario_id, primer_dia, ultimo_dia, 'ingreso')
-        total_egresos = Transaccion.get_total_por_tipo(usuario_id, primer_dia, ultimo_dia, 'egreso')
-        
-        # Cantidad de transacciones
-        num_transacciones = Transaccion.query.filter(
-            Transaccion.usuario_id == usuario_id,
-            Transaccion.fecha_transaccion >= primer_dia,
-            Transaccion.fecha_transaccion <= ultimo_dia
-        ).count()
-        
+        from app.models.saldo_mensual import SaldoMensual
+
+        # Totales y cantidad desde el agregado mensual materializado, sin
+        # escanear la tabla de transacciones
+        total_ingresos = SaldoMensual.obtener_total(usuario_id, anio, mes, 'ingreso')
+        total_egresos = SaldoMensual.obtener_total(usuario_id, anio, mes, 'egreso')
+        num_transacciones = SaldoMensual.obtener_cantidad(usuario_id, anio, mes)
+
         # Promedio diario
         promedio_ingresos = total_ingresos / monthrange(anio, mes)[1]
         promedio_egresos = total_egresos / monthrange(anio, mes)[1]
@@ -780,6 +808,133 @@ class Transaccion(db.Model):
 # EVENT LISTENERS
 # ==========================================
 
+from app.utils.cache_utils import invalidar_estadisticas_usuario
+from app.utils import precalculo
+
+# Campos cuyo valor anterior necesita after_update para revertir el
+# efecto de la versión previa de la transacción sobre los saldos
+_CAMPOS_SALDO = ('monto', 'tipo', 'cuenta_id', 'categoria_id', 'fecha_transaccion')
+
+# Con historial activo, el ORM carga el valor anterior en el momento de
+# la asignación: get_history().deleted llega siempre poblado al listener.
+# Sin esto, asignar sobre un atributo expirado (p. ej. cualquier edición
+# después de un commit() en la misma sesión, o con load_only) deja la
+# historia sin valor previo y el delta se calcularía contra un estado
+# parcial o nulo, corrompiendo el saldo en silencio. Se activa en
+# mapper_configured porque los impl de los atributos no existen hasta
+# que el mapper termina de configurarse.
+@event.listens_for(Transaccion, 'mapper_configured')
+def _activar_historial_saldo(mapper, clase):
+    for campo in _CAMPOS_SALDO:
+        getattr(clase, campo).impl.active_history = True
+
+
+def _marcar_modificacion_usuario(connection, usuario_id):
+    """
+    Sella la última mutación de transacciones del usuario
+
+    El timestamp alimenta los ETags de los endpoints JSON: como el
+    usuario ya está cargado en cada petición por Flask-Login, validar el
+    ETag no cuesta ninguna consulta extra.
+
+    Args:
+        connection: Conexión activa (la del listener)
+        usuario_id (int): ID del usuario
+    """
+    from app.models.usuario import Usuario
+
+    connection.execute(
+        db.update(Usuario)
+        .where(Usuario.id == usuario_id)
+        .values(ultima_modificacion_tx=func.now())
+    )
+
+
+def _aplicar_delta_saldo(connection, usuario_id, cuenta_id, categoria_id, fecha, tipo, monto, signo):
+    """
+    Aplica el efecto de una transacción al saldo de la cuenta y al
+    agregado mensual
+
+    La aritmética se ejecuta en SQL (saldo_actual = saldo_actual + delta)
+    sobre la conexión del flush, sin cargar la cuenta en el ORM ni
+    reconstruir objetos Decimal en Python.
+
+    Args:
+        connection: Conexión activa (la del listener)
+        usuario_id (int): ID del usuario
+        cuenta_id (int): ID de la cuenta afectada
+        categoria_id (int): ID de la categoría de la transacción
+        fecha (date): Fecha de la transacción
+        tipo (str): 'ingreso' o 'egreso'
+        monto (Decimal): Monto de la transacción
+        signo (int): +1 para aplicar, -1 para revertir
+    """
+    from app.models.cuenta import Cuenta
+    from app.models.saldo_mensual import SaldoMensual
+
+    if tipo == 'ingreso':
+        delta_cuenta = signo * monto
+    else:
+        delta_cuenta = -signo * monto
+
+    connection.execute(
+        db.update(Cuenta)
+        .where(Cuenta.id == cuenta_id)
+        .values(
+            saldo_actual=Cuenta.saldo_actual + delta_cuenta,
+            fecha_modificacion=func.now()
+        )
+    )
+
+    # Mantener el agregado mensual (vista materializada incremental)
+    SaldoMensual.aplicar_delta(
+        connection,
+        usuario_id=usuario_id,
+        fecha=fecha,
+        tipo=tipo,
+        categoria_id=categoria_id,
+        delta=signo * monto,
+        delta_cantidad=signo
+    )
+
+
+def _recalcular_saldos_usuario(connection, usuario_id):
+    """
+    Recalcula desde la tabla base los saldos de las cuentas del usuario
+    y reconstruye sus agregados mensuales
+
+    Camino de último recurso de actualizar_saldo_update: si el estado
+    anterior de una edición no pudo capturarse completo, aplicar un delta
+    a ciegas escribiría saldos incorrectos; recalcular es más caro pero
+    deja los saldos consistentes.
+
+    Args:
+        connection: Conexión activa (la del listener)
+        usuario_id (int): ID del usuario
+    """
+    from sqlalchemy import case
+    from app.models.cuenta import Cuenta
+    from app.models.saldo_mensual import SaldoMensual
+
+    balance = db.select(
+        func.coalesce(func.sum(case(
+            (Transaccion.tipo == 'ingreso', Transaccion.monto),
+            else_=-Transaccion.monto
+        )), 0)
+    ).where(Transaccion.cuenta_id == Cuenta.id).scalar_subquery()
+
+    connection.execute(
+        db.update(Cuenta)
+        .where(Cuenta.usuario_id == usuario_id)
+        .values(
+            saldo_actual=Cuenta.saldo_inicial + balance,
+            fecha_modificacion=func.now()
+        )
+    )
+
+    SaldoMensual.reconstruir_en_conexion(connection, usuario_id)
+
+
 @event.listens_for(Transaccion, 'after_insert')
 def actualizar_saldo_insert(mapper, connection, target):
     """
@@ -787,28 +942,28 @@ def actualizar_saldo_insert(mapper, connection, target):
     IMPORTANTE: Este listener reemplaza los triggers de MySQL
     """
     try:
-        from app.models.cuenta import Cuenta
-        
-        # Usar connection.execute en lugar de query para evitar problemas en listeners
-        cuenta = db.session.query(Cuenta).get(target.cuenta_id)
-        
-        if cuenta:
-            if target.tipo == 'ingreso':
-                cuenta.saldo_actual = Decimal(str(cuenta.saldo_actual)) + Decimal(str(target.monto))
-            else:
-                cuenta.saldo_actual = Decimal(str(cuenta.saldo_actual)) - Decimal(str(target.monto))
-            
-            cuenta.fecha_modificacion = datetime.utcnow()
-            db.session.commit()
-            
-            logger.info(
-                f"Saldo actualizado para cuenta {cuenta.id}: "
-                f"{'+'if target.tipo == 'ingreso' else '-'}{target.monto}"
-            )
-    
+        _aplicar_delta_saldo(
+            connection,
+            usuario_id=target.usuario_id,
+            cuenta_id=target.cuenta_id,
+            categoria_id=target.categoria_id,
+            fecha=target.fecha_transaccion,
+            tipo=target.tipo,
+            monto=target.monto,
+            signo=1
+        )
+
+        _marcar_modificacion_usuario(connection, target.usuario_id)
+        invalidar_estadisticas_usuario(target.usuario_id)
+        precalculo.encolar(target.usuario_id)
+
+        logger.info(
+            f"Saldo actualizado para cuenta {target.cuenta_id}: "
+            f"{'+'if target.tipo == 'ingreso' else '-'}{target.monto}"
+        )
+
     except Exception as e:
         logger.error(f"Error al actualizar saldo en insert: {str(e)}")
-        db.session.rollback()
 
 
 @event.listens_for(Transaccion, 'after_delete')
@@ -817,57 +972,119 @@ def actualizar_saldo_delete(mapper, connection, target):
     Actualiza el saldo de la cuenta después de eliminar una transacción
     """
     try:
-        from app.models.cuenta import Cuenta
-        
-        cuenta = db.session.query(Cuenta).get(target.cuenta_id)
-        
-        if cuenta:
-            # Revertir la operación
-            if target.tipo == 'ingreso':
-                cuenta.saldo_actual = Decimal(str(cuenta.saldo_actual)) - Decimal(str(target.monto))
-            else:
-                cuenta.saldo_actual = Decimal(str(cuenta.saldo_actual)) + Decimal(str(target.monto))
-            
-            cuenta.fecha_modificacion = datetime.utcnow()
-            db.session.commit()
-            
-            logger.info(
-                f"Saldo revertido para cuenta {cuenta.id}: "
-                f"{'{'if target.tipo == 'ingreso' else '+'}{target.monto}"
-            )
-    
+        # Revertir la operación
+        _aplicar_delta_saldo(
+            connection,
+            usuario_id=target.usuario_id,
+            cuenta_id=target.cuenta_id,
+            categoria_id=target.categoria_id,
+            fecha=target.fecha_transaccion,
+            tipo=target.tipo,
+            monto=target.monto,
+            signo=-1
+        )
+
+        _marcar_modificacion_usuario(connection, target.usuario_id)
+        invalidar_estadisticas_usuario(target.usuario_id)
+        precalculo.encolar(target.usuario_id)
+
+        logger.info(
+            f"Saldo revertido para cuenta {target.cuenta_id}: "
+            f"{'-'if target.tipo == 'ingreso' else '+'}{target.monto}"
+        )
+
     except Exception as e:
         logger.error(f"Error al actualizar saldo en delete: {str(e)}")
-        db.session.rollback()
 
 
 @event.listens_for(Transaccion, 'before_update')
 def registrar_edicion(mapper, connection, target):
     """
-    Registra cuando una transacción es editada
+    Registra cuando una transacción es editada y captura los valores
+    previos que afectan saldos
     """
+    from sqlalchemy.orm.attributes import get_history
+
     target.editada = True
     target.num_ediciones += 1
-    target.fecha_modificacion = datetime.utcnow()
+    # fecha_modificacion la sella la BD vía onupdate=func.now()
+
+    # Capturar el estado anterior solo de los campos que afectan saldos,
+    # para que after_update aplique el delta sin re-inspeccionar historia
+    previos = {}
+    desconocidos = False
+    for campo in _CAMPOS_SALDO:
+        historia = get_history(target, campo)
+        if not historia.has_changes():
+            continue
+        if historia.deleted:
+            previos[campo] = historia.deleted[0]
+        else:
+            # Cambio sin valor anterior disponible (no debería ocurrir
+            # con active_history, pero un delta a ciegas corrompería el
+            # saldo): after_update recalculará en lugar de revertir
+            desconocidos = True
+
+    target._valores_previos = previos
+    target._previos_desconocidos = desconocidos
 
 
 @event.listens_for(Transaccion, 'after_update')
 def actualizar_saldo_update(mapper, connection, target):
     """
-    Actualiza saldos si cambió el monto, tipo o cuenta
+    Actualiza saldos si cambió el monto, tipo, cuenta o fecha
+
+    Revierte el efecto de los valores anteriores (capturados en
+    before_update) y aplica el de los nuevos, en dos UPDATE dirigidos.
+    Si algún valor anterior no pudo capturarse, recalcula los saldos del
+    usuario desde la tabla base en lugar de aplicar un delta incierto.
+    En cualquier edición, también la de campos sin efecto en saldos,
+    sella ultima_modificacion_tx e invalida los cachés del usuario.
     """
-    # Obtener el estado anterior
-    history = db.inspect(target).attrs
-    
-    monto_cambio = history.monto.history.has_changes()
-    tipo_cambio = history.tipo.history.has_changes()
-    cuenta_cambio = history.cuenta_id.history.has_changes()
-    
-    if monto_cambio or tipo_cambio or cuenta_cambio:
-        logger.warning(
-            f"Transacción {target.id} modificada. "
-            f"Recomendado recalcular saldos de cuentas afectadas."
-        )
-        
-        # Aquí podrías implementar lógica para recalcular automáticamente
-        # Por ahora solo logueamos
\ No newline at end of file
+    previos = target.__dict__.pop('_valores_previos', None)
+    desconocidos = target.__dict__.pop('_previos_desconocidos', False)
+
+    try:
+        if desconocidos:
+            logger.warning(
+                f"Estado anterior incompleto al editar transacción {target.id}: "
+                f"recalculando saldos del usuario {target.usuario_id}"
+            )
+            _recalcular_saldos_usuario(connection, target.usuario_id)
+            logger.info(f"Saldos recalculados tras edición de transacción {target.id}")
+        elif previos:
+            # Revertir el efecto de la versión anterior
+            _aplicar_delta_saldo(
+                connection,
+                usuario_id=target.usuario_id,
+                cuenta_id=previos.get('cuenta_id', target.cuenta_id),
+                categoria_id=previos.get('categoria_id', target.categoria_id),
+                fecha=previos.get('fecha_transaccion', target.fecha_transaccion),
+                tipo=previos.get('tipo', target.tipo),
+                monto=previos.get('monto', target.monto),
+                signo=-1
+            )
+
+            # Aplicar el efecto de la versión nueva
+            _aplicar_delta_saldo(
+                connection,
+                usuario_id=target.usuario_id,
+                cuenta_id=target.cuenta_id,
+                categoria_id=target.categoria_id,
+                fecha=target.fecha_transaccion,
+                tipo=target.tipo,
+                monto=target.monto,
+                signo=1
+            )
+
+            logger.info(f"Saldos recalculados tras edición de transacción {target.id}")
+
+        # Toda edición sella la última modificación e invalida los cachés,
+        # aunque no afecte saldos: un cambio de descripción también debe
+        # vencer los ETags y el resumen (ultima_transaccion) del usuario
+        _marcar_modificacion_usuario(connection, target.usuario_id)
+        invalidar_estadisticas_usuario(target.usuario_id)
+        precalculo.encolar(target.usuario_id)
+
+    except Exception as e:
+        logger.error(f"Error al actualizar saldo en update: {str(e)}")
\ No newline at end of file
@@ -27,6 +27,10 @@ class Usuario(UserMixin, db.Model):
     fecha_registro = db.Column(db.DateTime, default=datetime.utcnow)
     ultimo_acceso = db.Column(db.DateTime)
     activo = db.Column(db.Boolean, default=True)
+    # Sello de la última mutación de transacciones del usuario; lo
+    # mantienen los listeners de Transaccion y alimenta los ETags de los
+    # endpoints JSON sin consultas adicionales
+    ultima_modificacion_tx = db.Column(db.DateTime)
     
     # Campos de perfil
     avatar_url = db.Column(db.String(255))
@@ -35,10 +39,14 @@ class Usuario(UserMixin, db.Model):
     # Relaciones
     configuracion = db.relationship('ConfiguracionUsuario', backref='usuario', lazy=True, uselist=False, cascade='all, delete-orphan')
     categorias = db.relationship('Categoria', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
-    cuentas = db.relationship('Cuenta', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
-    transacciones = db.relationship('Transaccion', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
+    # lazy='raise' en las colecciones de alto tráfico: cualquier acceso
+    # accidental (que cargaría toda la colección o re-ejecutaría SQL por
+    # acceso, como hacía lazy='dynamic') falla en desarrollo; las rutas
+    # calientes usan consultas explícitas de agregación en su lugar
+    cuentas = db.relationship('Cuenta', backref='usuario', lazy='raise', cascade='all, delete-orphan')
+    transacciones = db.relationship('Transaccion', backref='usuario', lazy='raise', cascade='all, delete-orphan')
     presupuestos = db.relationship('Presupuesto', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
-    metas_ahorro = db.relationship('MetaAhorro', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
+    metas_ahorro = db.relationship('MetaAhorro', backref='usuario', lazy='raise', cascade='all, delete-orphan')
     consejos = db.relationship('ConsejoFinanciero', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
     sesiones = db.relationship('Sesion', backref='usuario', lazy='dynamic', cascade='all, delete-orphan')
     logs = db.relationship('LogActividad', backref='usuario', lazy='dynamic')
@@ -59,14 +67,40 @@ class Usuario(UserMixin, db.Model):
     def check_password(self, password):
         """
         Verifica si la contraseña proporcionada es correcta
-        
+
+        Si el hash almacenado fue generado con un costo menor al
+        configurado, se rehashea con el costo actual (el costo se
+        amortiza en un login exitoso en lugar de migrar todo de golpe).
+
         Args:
             password (str): Contraseña a verificar
-            
+
         Returns:
             bool: True si la contraseña es correcta, False en caso contrario
         """
-        return bcrypt.check_password_hash(self.password_hash, password)
+        es_valida = bcrypt.check_password_hash(self.password_hash, password)
+
+        if es_valida and self.necesita_rehash():
+            self.set_password(password)
+
+        return es_valida
+
+    def necesita_rehash(self):
+        """
+        Verifica si el hash almacenado usa un costo menor al configurado
+
+        Returns:
+            bool: True si el hash debe regenerarse con el costo actual
+        """
+        from flask import current_app
+
+        try:
+            # Formato bcrypt: $2b$<costo>$<salt+hash>
+            costo_almacenado = int(self.password_hash.split('$')[2])
+        except (IndexError, ValueError):
+            return False
+
+        return costo_almacenado < current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
     
     def is_admin(self):
         """
@@ -85,56 +119,53 @@ class Usuario(UserMixin, db.Model):
     def get_balance_total(self):
         """
         Calcula el balance total del usuario sumando todas sus cuentas
-        
+
+        La suma se hace en SQL en lugar de iterar las cuentas en Python.
+
         Returns:
             float: Balance total en la moneda preferida del usuario
         """
-        total = 0.0
-        for cuenta in self.cuentas.filter_by(activo=True):
-            total += float(cuenta.saldo_actual)
-        return total
+        from sqlalchemy import func
+        from app.models.cuenta import Cuenta
+
+        total = db.session.query(func.sum(Cuenta.saldo_actual)).filter_by(
+            usuario_id=self.id,
+            activo=True
+        ).scalar()
+
+        return float(total) if total is not None else 0.0
     
     def get_ingresos_mes_actual(self):
         """
         Obtiene el total de ingresos del mes actual
-        
+
+        Lee del agregado mensual materializado (saldo_mensual) en lugar
+        de sumar la tabla de transacciones en cada petición.
+
         Returns:
             float: Total de ingresos del mes
         """
-        from sqlalchemy import func, extract
-        
-        mes_actual = datetime.now().month
-        anio_actual = datetime.now().year
-        
-        resultado = db.session.query(func.sum(Transaccion.monto)).filter(
-            Transaccion.usuario_id == self.id,
-            Transaccion.tipo == 'ingreso',
-            extract('month', Transaccion.fecha_transaccion) == mes_actual,
-            extract('year', Transaccion.fecha_transaccion) == anio_actual
-        ).scalar()
-        
-        return float(resultado) if resultado else 0.0
-    
+        from app.models.saldo_mensual import SaldoMensual
+
+        ahora = datetime.now()
+        total = SaldoMensual.obtener_total(self.id, ahora.year, ahora.month, 'ingreso')
+        return float(total)
+
     def get_egresos_mes_actual(self):
         """
         Obtiene el total de egresos del mes actual
-        
+
+        Lee del agregado mensual materializado (saldo_mensual) en lugar
+        de sumar la tabla de transacciones en cada petición.
+
         Returns:
             float: Total de egresos del mes
         """
-        from sqlalchemy import func, extract
-        
-        mes_actual = datetime.now().month
-        anio_actual = datetime.now().year
-        
-        resultado = db.session.query(func.sum(Transaccion.monto)).filter(
-            Transaccion.usuario_id == self.id,
-            Transaccion.tipo == 'egreso',
-            extract('month', Transaccion.fecha_transaccion) == mes_actual,
-            extract('year', Transaccion.fecha_transaccion) == anio_actual
-        ).scalar()
-        
-        return float(resultado) if resultado else 0.0
+        from app.models.saldo_mensual import SaldoMensual
+
+        ahora = datetime.now()
+        total = SaldoMensual.obtener_total(self.id, ahora.year, ahora.month, 'egreso')
+        return float(total)
     
     def get_balance_mes_actual(self):
         """
@@ -148,18 +179,57 @@ class Usuario(UserMixin, db.Model):
     def get_estadisticas_resumen(self):
         """
         Obtiene un resumen de estadísticas del usuario
-        
+
+        El resultado se memoiza por usuario (60s): varios endpoints lo
+        piden dentro de la misma sesión de uso y los listeners de
+        Transaccion/Presupuesto invalidan la clave en cada mutación, así
+        que el TTL solo es red de seguridad.
+
         Returns:
             dict: Diccionario con estadísticas principales
         """
+        from app import cache
+        from app.utils import cache_utils
+
+        clave = cache_utils.CLAVE_RESUMEN_USUARIO.format(self.id)
+        datos = cache.get(clave)
+
+        if datos is None:
+            datos = self._calcular_estadisticas_resumen()
+            cache.set(clave, datos, timeout=60)
+
+        return datos
+
+    def _calcular_estadisticas_resumen(self):
+        """
+        Calcula el resumen de estadísticas consultando la base de datos
+
+        Returns:
+            dict: Diccionario con estadísticas principales
+        """
+        from sqlalchemy import func
+        from app.models.cuenta import Cuenta
+        from app.models.meta_ahorro import MetaAhorro
+        from app.models.transaccion import Transaccion
+
+        total_cuentas = db.session.query(func.count(Cuenta.id)).filter_by(
+            usuario_id=self.id, activo=True
+        ).scalar()
+        total_transacciones = db.session.query(func.count(Transaccion.id)).filter_by(
+            usuario_id=self.id
+        ).scalar()
+        metas_activas = db.session.query(func.count(MetaAhorro.id)).filter_by(
+            usuario_id=self.id, completada=False
+        ).scalar()
+
         return {
             'balance_total': self.get_balance_total(),  # ✅ AGREGAR ESTA LÍNEA
             'ingresos_mes': self.get_ingresos_mes_actual(),
             'egresos_mes': self.get_egresos_mes_actual(),
             'balance_mes': self.get_balance_mes_actual(),
-            'total_cuentas': self.cuentas.filter_by(activo=True).count(),
-            'total_transacciones': self.transacciones.count(),
-            'metas_activas': self.metas_ahorro.filter_by(completada=False).count()
+            'total_cuentas': total_cuentas,
+            'total_transacciones': total_transacciones,
+            'metas_activas': metas_activas
         }
     
     def to_dict(self):
@@ -193,7 +263,9 @@ class ConfiguracionUsuario(db.Model):
     __tablename__ = 'configuracion_usuario'
     
     id = db.Column(db.Integer, primary_key=True)
-    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False)
+    # Único: una fila de configuración por usuario, lo que además permite
+    # hacer upsert con INSERT ... ON DUPLICATE KEY UPDATE
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id', ondelete='CASCADE'), nullable=False, unique=True)
     
     # Configuraciones
     notificaciones_email = db.Column(db.Boolean, default=True)
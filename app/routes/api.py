@@ -1,54 +1,120 @@
 """
 API RESTful para la aplicación
 """
+from decimal import Decimal, InvalidOperation
+
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
+from sqlalchemy.exc import DataError, IntegrityError
+
 from app import db
 from app.models.transaccion import Transaccion
 
 bp = Blueprint('api', __name__, url_prefix='/api')
 
+
+def _validar_transaccion(data):
+    """
+    Valida el payload de creación de transacción antes de tocar la BD
+
+    Args:
+        data (dict): Payload JSON de la petición
+
+    Returns:
+        list: Lista de mensajes de error (vacía si el payload es válido)
+    """
+    errores = []
+
+    for campo in ('cuenta_id', 'categoria_id', 'tipo', 'monto'):
+        if data.get(campo) in (None, ''):
+            errores.append(f'El campo {campo} es obligatorio')
+
+    if errores:
+        return errores
+
+    # Los IDs deben ser enteros (o strings numéricos, como envía un
+    # formulario); de lo contrario el INSERT fallaría con DataError
+    for campo in ('cuenta_id', 'categoria_id'):
+        valor = data[campo]
+        if isinstance(valor, bool) or not (
+            isinstance(valor, int)
+            or (isinstance(valor, str) and valor.isdigit())
+        ):
+            errores.append(f'El campo {campo} debe ser un ID numérico')
+
+    if data['tipo'] not in ('ingreso', 'egreso'):
+        errores.append("El tipo debe ser 'ingreso' o 'egreso'")
+
+    try:
+        monto = Decimal(str(data['monto']))
+        if monto <= 0:
+            errores.append('El monto debe ser mayor a cero')
+    except (InvalidOperation, ValueError):
+        errores.append('El monto debe ser un número válido')
+
+    return errores
+
 @bp.route('/transacciones', methods=['GET'])
 @login_required
 def get_transacciones():
-    """Obtiene transacciones del usuario"""
-    transacciones = Transaccion.query.filter_by(
-        usuario_id=current_user.id
-    ).limit(50).all()
-    
+    """
+    Obtiene transacciones del usuario (paginación keyset)
+
+    Acepta ?before_id=<id> para pedir la página anterior al cursor;
+    la respuesta incluye next_cursor para la página siguiente.
+    """
+    before_id = request.args.get('before_id', type=int)
+
+    query = Transaccion.query.filter_by(usuario_id=current_user.id)
+
+    if before_id:
+        query = query.filter(Transaccion.id < before_id)
+
+    transacciones = query.order_by(Transaccion.id.desc()).limit(50).all()
+
     return jsonify({
         'success': True,
-        'data': [t.to_dict() for t in transacciones]
+        'data': [t.to_dict() for t in transacciones],
+        'next_cursor': transacciones[-1].id if transacciones else None
     })
 
 @bp.route('/transacciones', methods=['POST'])
 @login_required
 def create_transaccion():
     """Crea una nueva transacción"""
-    data = request.get_json()
-    
+    data = request.get_json(silent=True) or {}
+
+    # Validar el payload antes de construir el modelo: los errores de
+    # entrada se detectan sin pagar excepciones del ORM en el camino feliz
+    errores = _validar_transaccion(data)
+    if errores:
+        return jsonify({
+            'success': False,
+            'message': '; '.join(errores)
+        }), 400
+
+    transaccion = Transaccion(
+        usuario_id=current_user.id,
+        cuenta_id=data['cuenta_id'],
+        categoria_id=data['categoria_id'],
+        tipo=data['tipo'],
+        monto=data['monto'],
+        descripcion=data.get('descripcion', '')
+    )
+
     try:
-        transaccion = Transaccion(
-            usuario_id=current_user.id,
-            cuenta_id=data['cuenta_id'],
-            categoria_id=data['categoria_id'],
-            tipo=data['tipo'],
-            monto=data['monto'],
-            descripcion=data.get('descripcion', '')
-        )
-        
         db.session.add(transaccion)
         db.session.commit()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Transacción creada',
-            'data': transaccion.to_dict()
-        }), 201
-        
-    except Exception as e:
+    except (IntegrityError, DataError):
+        # Violación de FK/CHECK o valor rechazado por el tipo de columna
         db.session.rollback()
         return jsonify({
             'success': False,
-            'message': str(e)
-        }), 400
\ No newline at end of file
+            'message': 'La cuenta o categoría indicada no es válida'
+        }), 409
+
+    return jsonify({
+        'success': True,
+        'message': 'Transacción creada',
+        'data': transaccion.to_dict()
+    }), 201
\ No newline at end of file
@@ -42,7 +42,7 @@ def login():
             usuario.actualizar_ultimo_acceso()
             
             # Registrar en el log
-            LogActividad.registrar(
+            LogActividad.registrar_diferido(
                 usuario_id=usuario.id,
                 accion='login',
                 detalle='Inicio de sesión exitoso',
@@ -59,7 +59,7 @@ def login():
             
             # Registrar intento fallido
             if usuario:
-                LogActividad.registrar(
+                LogActividad.registrar_diferido(
                     usuario_id=usuario.id,
                     accion='login_fallido',
                     detalle='Intento de inicio de sesión con contraseña incorrecta',
@@ -104,7 +104,7 @@ def registro():
             db.session.commit()
             
             # Registrar en el log
-            LogActividad.registrar(
+            LogActividad.registrar_diferido(
                 usuario_id=nuevo_usuario.id,
                 accion='registro',
                 detalle='Nuevo usuario registrado',
@@ -127,7 +127,7 @@ def logout():
     
     if current_user.is_authenticated:
         # Registrar en el log
-        LogActividad.registrar(
+        LogActividad.registrar_diferido(
             usuario_id=current_user.id,
             accion='logout',
             detalle='Cierre de sesión',
@@ -162,7 +162,7 @@ def cambiar_password():
         db.session.commit()
         
         # Registrar en el log
-        LogActividad.registrar(
+        LogActividad.registrar_diferido(
             usuario_id=current_user.id,
             accion='cambio_password',
             detalle='Contraseña cambiada exitosamente',
@@ -192,7 +192,7 @@ def recuperar_password():
             # Por ahora solo mostramos un mensaje
             
             # Registrar en el log
-            LogActividad.registrar(
+            LogActividad.registrar_diferido(
                 usuario_id=usuario.id,
                 accion='solicitud_recuperacion_password',
                 detalle='Solicitud de recuperación de contraseña',
@@ -11,25 +11,45 @@ Mejoras implementadas:
 - Respuestas JSON para AJAX
 """
 
-from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash
+from flask import Blueprint, render_template, redirect, url_for, request, jsonify, flash, Response, stream_with_context, make_response
+from functools import wraps
 from flask_login import login_required, current_user
-from app import db
+from app import db, cache
 from app.models.transaccion import Transaccion
 from app.models.cuenta import Cuenta
 from app.models.presupuesto import Presupuesto
 from app.models.meta_ahorro import MetaAhorro
 from app.models.categoria import Categoria
 from app.models.otros import ConsejoFinanciero, LogActividad
+from app.models.saldo_mensual import SaldoMensual
+from app.utils import cache_utils, parallel
 from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
 from sqlalchemy import func, extract, desc
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import selectinload
 from decimal import Decimal
 import logging
+import orjson
 
 # Configurar logger
 logger = logging.getLogger(__name__)
 
 bp = Blueprint('main', __name__)
 
+# Nombres de mes abreviados en español (constante de módulo: se evita
+# reconstruir la lista en cada iteración del bucle de tendencia)
+MESES_ES = ('Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
+            'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic')
+
+# Umbrales de salud financiera (puntuación mínima, nivel, color)
+NIVELES_SALUD = (
+    (80, 'excelente', 'success'),
+    (60, 'bueno', 'info'),
+    (40, 'regular', 'warning'),
+    (0, 'critico', 'danger'),
+)
+
 
 # ==========================================
 # UTILIDADES Y DECORADORES
@@ -60,16 +80,50 @@ def obtener_rango_fechas_mes(mes=None, anio=None):
     return fecha_inicio, fecha_fin
 
 
+def con_etag_transacciones(vista):
+    """
+    Valida y adjunta un ETag débil derivado de la última mutación de
+    transacciones del usuario
+
+    El sello ultima_modificacion_tx ya viene cargado con el usuario de
+    Flask-Login, así que responder 304 a un poll sin cambios no cuesta
+    ninguna consulta ni serialización.
+
+    Args:
+        vista: Función de vista a envolver
+
+    Returns:
+        function: Vista envuelta con manejo de If-None-Match
+    """
+    @wraps(vista)
+    def envoltura(*args, **kwargs):
+        marca = current_user.ultima_modificacion_tx
+        etag = f'{current_user.id}-{int(marca.timestamp()) if marca else 0}'
+
+        if request.if_none_match.contains_weak(etag):
+            return '', 304
+
+        respuesta = make_response(vista(*args, **kwargs))
+        if respuesta.status_code == 200:
+            respuesta.set_etag(etag, weak=True)
+        return respuesta
+
+    return envoltura
+
+
 def registrar_actividad(accion, detalle=None):
     """
     Registra una actividad del usuario
-    
+
+    La escritura es diferida: el evento se encola y el buffer de fondo lo
+    inserta en lote, sin INSERT + COMMIT en el camino de la petición.
+
     Args:
         accion (str): Acción realizada
         detalle (str): Detalles adicionales
     """
     try:
-        LogActividad.registrar(
+        LogActividad.registrar_diferido(
             usuario_id=current_user.id,
             accion=accion,
             detalle=detalle,
@@ -106,139 +160,227 @@ def dashboard():
         registrar_actividad('acceso_dashboard')
         
         # ==========================================
-        # ESTADÍSTICAS GENERALES
+        # PARÁMETROS COMUNES
         # ==========================================
-        estadisticas = current_user.get_estadisticas_resumen()
-        
+        usuario = current_user._get_current_object()
+        usuario_id = usuario.id
+
+        hoy = datetime.now()
+        fecha_inicio, fecha_fin = obtener_rango_fechas_mes(hoy.month, hoy.year)
+        per_page = 10
+        cursor = request.args.get('after')
+
+        # Meses de la tendencia: relativedelta retrocede meses calendario
+        # reales (restar 30 días por mes saltaba o repetía meses)
+        inicio_mes = hoy.date().replace(day=1)
+        pares_meses = []
+        for i in range(5, -1, -1):
+            fecha_mes = inicio_mes - relativedelta(months=i)
+            pares_meses.append((fecha_mes.year, fecha_mes.month))
+
         # ==========================================
-        # CUENTAS ACTIVAS
+        # CONSULTAS (ejecutadas en paralelo)
         # ==========================================
-        cuentas = Cuenta.query.filter_by(
-            usuario_id=current_user.id,
-            activo=True
-        ).order_by(Cuenta.fecha_creacion.desc()).all()
-        
+        # Todas son lecturas independientes entre sí: se reparten en un
+        # pool de hilos con sesión propia y la latencia del dashboard
+        # pasa de la suma de las consultas al máximo de ellas
+
+        def _consulta_cuentas():
+            return Cuenta.query.filter_by(
+                usuario_id=usuario_id,
+                activo=True
+            ).order_by(Cuenta.fecha_creacion.desc()).all()
+
+        def _consulta_recientes():
+            # Paginación keyset sobre (fecha, hora, id): el cursor
+            # ?after= busca directamente por el índice compuesto en lugar
+            # de descartar OFFSET filas en páginas profundas.
+            # selectinload evita un SELECT por fila al renderizar la
+            # cuenta y la categoría de cada transacción
+            consulta = Transaccion.query.options(
+                selectinload(Transaccion.cuenta),
+                selectinload(Transaccion.categoria)
+            ).filter_by(usuario_id=usuario_id)
+
+            if cursor:
+                try:
+                    fecha_cur, hora_cur, id_cur = cursor.split(',')
+                    consulta = consulta.filter(
+                        db.tuple_(
+                            Transaccion.fecha_transaccion,
+                            Transaccion.hora_transaccion,
+                            Transaccion.id
+                        ) < (fecha_cur, hora_cur, int(id_cur))
+                    )
+                except ValueError:
+                    logger.warning(f"Cursor de paginación inválido: {cursor}")
+
+            # Una fila extra para saber si hay página siguiente
+            return consulta.order_by(
+                Transaccion.fecha_transaccion.desc(),
+                Transaccion.hora_transaccion.desc(),
+                Transaccion.id.desc()
+            ).limit(per_page + 1).all()
+
+        def _consulta_metas():
+            return MetaAhorro.query.filter_by(
+                usuario_id=usuario_id,
+                completada=False
+            ).order_by(MetaAhorro.fecha_objetivo).limit(5).all()
+
+        def _consulta_categorias():
+            # Totales del mes por categoría y tipo desde el agregado
+            # mensual; de aquí salen el gráfico de gastos y la categoría
+            # más usada sin tocar la tabla de transacciones
+            return db.session.query(
+                Categoria.nombre,
+                Categoria.color,
+                SaldoMensual.tipo,
+                func.sum(SaldoMensual.total).label('total'),
+                func.sum(SaldoMensual.cantidad).label('cantidad')
+            ).join(
+                Categoria, Categoria.id == SaldoMensual.categoria_id
+            ).filter(
+                SaldoMensual.usuario_id == usuario_id,
+                SaldoMensual.anio == hoy.year,
+                SaldoMensual.mes == hoy.month
+            ).group_by(Categoria.id, SaldoMensual.tipo).all()
+
+        def _consulta_tendencia():
+            return db.session.query(
+                SaldoMensual.anio,
+                SaldoMensual.mes,
+                SaldoMensual.tipo,
+                SaldoMensual.total
+            ).filter(
+                SaldoMensual.usuario_id == usuario_id,
+                db.tuple_(SaldoMensual.anio, SaldoMensual.mes).in_(pares_meses)
+            ).all()
+
+        def _consulta_transaccion_mayor():
+            return Transaccion.query.filter(
+                Transaccion.usuario_id == usuario_id,
+                Transaccion.fecha_transaccion >= fecha_inicio,
+                Transaccion.fecha_transaccion <= fecha_fin,
+                Transaccion.tipo == 'egreso'
+            ).order_by(desc(Transaccion.monto)).first()
+
+        resultados = parallel.ejecutar_consultas({
+            'estadisticas': usuario.get_estadisticas_resumen,
+            'cuentas': _consulta_cuentas,
+            'recientes': _consulta_recientes,
+            'presupuestos': lambda: Presupuesto.get_presupuestos_activos(usuario_id),
+            'metas': _consulta_metas,
+            'consejos': lambda: ConsejoFinanciero.get_consejos_no_vistos(usuario_id),
+            'categorias': _consulta_categorias,
+            'tendencia': _consulta_tendencia,
+            'transaccion_mayor': _consulta_transaccion_mayor,
+        })
+
+        estadisticas = resultados['estadisticas']
+        cuentas = resultados['cuentas']
+        filas_recientes = resultados['recientes']
+        transaccion_mayor = resultados['transaccion_mayor']
+
         # ==========================================
         # TRANSACCIONES RECIENTES
         # ==========================================
-        page = request.args.get('page', 1, type=int)
-        per_page = 10
-        
-        transacciones_paginadas = Transaccion.query.filter_by(
-            usuario_id=current_user.id
-        ).order_by(
-            Transaccion.fecha_transaccion.desc(),
-            Transaccion.hora_transaccion.desc()
-        ).paginate(page=page, per_page=per_page, error_out=False)
-        
-        transacciones_recientes = transacciones_paginadas.items
+        transacciones_recientes = filas_recientes[:per_page]
+
+        siguiente_cursor = None
+        if len(filas_recientes) > per_page:
+            ultima = transacciones_recientes[-1]
+            siguiente_cursor = (
+                f'{ultima.fecha_transaccion.isoformat()},'
+                f'{ultima.hora_transaccion.isoformat()},{ultima.id}'
+            )
         
         # ==========================================
         # PRESUPUESTOS
         # ==========================================
-        presupuestos_activos = Presupuesto.get_presupuestos_activos(current_user.id)
-        presupuestos_en_alerta = [p for p in presupuestos_activos if p.esta_en_alerta()]
-        presupuestos_excedidos = [p for p in presupuestos_activos if p.esta_excedido()]
+        presupuestos_activos = resultados['presupuestos']
+
+        # Una sola pasada para clasificar alertas y excesos
+        presupuestos_en_alerta = []
+        presupuestos_excedidos = []
+        for p in presupuestos_activos:
+            if p.esta_en_alerta():
+                presupuestos_en_alerta.append(p)
+            if p.esta_excedido():
+                presupuestos_excedidos.append(p)
         
         # ==========================================
         # METAS DE AHORRO
         # ==========================================
-        metas_activas = MetaAhorro.query.filter_by(
-            usuario_id=current_user.id,
-            completada=False
-        ).order_by(MetaAhorro.fecha_objetivo).limit(5).all()
-        
-        metas_proximas_vencer = [m for m in metas_activas if m.get_dias_restantes() <= 30]
+        metas_activas = resultados['metas']
+
+        # El predicado de vencimiento se evalúa en Python sobre las 5 metas
+        # ya cargadas (sin consulta extra); las rutas que necesitan todas
+        # las próximas a vencer filtran por fecha en SQL
+        limite_vencimiento = hoy.date() + timedelta(days=30)
+        metas_proximas_vencer = [m for m in metas_activas if m.fecha_objetivo <= limite_vencimiento]
         
         # ==========================================
         # CONSEJOS FINANCIEROS
         # ==========================================
-        consejos = ConsejoFinanciero.get_consejos_no_vistos(current_user.id)[:3]
-        
+        consejos = resultados['consejos'][:3]
+
         # ==========================================
         # DATOS PARA GRÁFICOS
         # ==========================================
-        
-        # Gastos por categoría del mes actual
-        fecha_inicio, fecha_fin = obtener_rango_fechas_mes()
-        
-        gastos_por_categoria = Transaccion.get_resumen_por_categoria(
-            usuario_id=current_user.id,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin,
-            tipo='egreso'
+        filas_categorias = resultados['categorias']
+
+        # Preparar datos para gráfico de categorías (solo egresos, de
+        # mayor a menor) y contar usos por categoría en la misma pasada
+        gastos_por_categoria = sorted(
+            (fila for fila in filas_categorias if fila.tipo == 'egreso'),
+            key=lambda fila: fila.total,
+            reverse=True
         )
-        
-        # Preparar datos para gráfico de categorías
+
         categorias_labels = []
         categorias_montos = []
         categorias_colores = []
-        
-        for nombre, color, total, cantidad in gastos_por_categoria:
+
+        for nombre, color, tipo, total, cantidad in gastos_por_categoria:
             categorias_labels.append(nombre)
             categorias_montos.append(float(total))
             categorias_colores.append(color)
+
+        usos_por_categoria = {}
+        for fila in filas_categorias:
+            usos_por_categoria[fila.nombre] = usos_por_categoria.get(fila.nombre, 0) + int(fila.cantidad)
         
-        # Tendencia de los últimos 6 meses
+        # Tendencia de los últimos 6 meses: una sola consulta sobre el
+        # agregado mensual en lugar de 12 agregaciones por separado
+        filas_tendencia = resultados['tendencia']
+
+        totales_mes = {
+            (anio, mes, tipo): float(total)
+            for anio, mes, tipo, total in filas_tendencia
+        }
+
         tendencia_meses = []
         tendencia_ingresos = []
         tendencia_egresos = []
-        
-        for i in range(5, -1, -1):
-            fecha_mes = datetime.now() - timedelta(days=30*i)
-            mes = fecha_mes.month
-            anio = fecha_mes.year
-            
-            fecha_inicio_mes, fecha_fin_mes = obtener_rango_fechas_mes(mes, anio)
-            
-            # Ingresos del mes
-            ingresos = Transaccion.get_total_por_tipo(
-                current_user.id, 
-                fecha_inicio_mes, 
-                fecha_fin_mes, 
-                'ingreso'
-            )
-            
-            # Egresos del mes
-            egresos = Transaccion.get_total_por_tipo(
-                current_user.id, 
-                fecha_inicio_mes, 
-                fecha_fin_mes, 
-                'egreso'
-            )
-            
-            # Nombre del mes en español
-            meses_es = ['Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
-                       'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
-            
-            tendencia_meses.append(meses_es[mes - 1])
-            tendencia_ingresos.append(float(ingresos))
-            tendencia_egresos.append(float(egresos))
+
+        for anio, mes in pares_meses:
+            tendencia_meses.append(MESES_ES[mes - 1])
+            tendencia_ingresos.append(totales_mes.get((anio, mes, 'ingreso'), 0.0))
+            tendencia_egresos.append(totales_mes.get((anio, mes, 'egreso'), 0.0))
         
         # ==========================================
         # ESTADÍSTICAS ADICIONALES
         # ==========================================
-        
-        # Transacción más grande del mes
-        transaccion_mayor = Transaccion.query.filter(
-            Transaccion.usuario_id == current_user.id,
-            Transaccion.fecha_transaccion >= fecha_inicio,
-            Transaccion.fecha_transaccion <= fecha_fin,
-            Transaccion.tipo == 'egreso'
-        ).order_by(desc(Transaccion.monto)).first()
-        
-        # Categoría más usada
-        categoria_mas_usada = db.session.query(
-            Categoria.nombre,
-            func.count(Transaccion.id).label('cantidad')
-        ).join(Transaccion).filter(
-            Transaccion.usuario_id == current_user.id,
-            Transaccion.fecha_transaccion >= fecha_inicio,
-            Transaccion.fecha_transaccion <= fecha_fin
-        ).group_by(Categoria.id).order_by(desc('cantidad')).first()
-        
-        # Promedio de gasto diario
-        dias_transcurridos = (datetime.now().date() - fecha_inicio).days + 1
+
+        # Categoría más usada: derivada de la consulta de categorías de
+        # arriba en lugar de re-agrupar las transacciones del mes
+        categoria_mas_usada = None
+        if usos_por_categoria:
+            categoria_mas_usada = max(usos_por_categoria.items(), key=lambda par: par[1])
+        
+        # Promedio de gasto diario (reutiliza el datetime.now() de arriba)
+        dias_transcurridos = (hoy.date() - fecha_inicio).days + 1
         promedio_gasto_diario = float(estadisticas['egresos_mes']) / dias_transcurridos if dias_transcurridos > 0 else 0
         
         # ==========================================
@@ -249,7 +391,7 @@ def dashboard():
                              estadisticas=estadisticas,
                              cuentas=cuentas,
                              transacciones_recientes=transacciones_recientes,
-                             transacciones_paginadas=transacciones_paginadas,
+                             siguiente_cursor=siguiente_cursor,
                              presupuestos_activos=presupuestos_activos,
                              presupuestos_en_alerta=presupuestos_en_alerta,
                              presupuestos_excedidos=presupuestos_excedidos,
@@ -278,21 +420,29 @@ def dashboard():
 
 @bp.route('/dashboard/actualizar-estadisticas')
 @login_required
+@con_etag_transacciones
+@cache.cached(timeout=60, key_prefix=lambda: cache_utils.CLAVE_ESTADISTICAS.format(current_user.id))
 def actualizar_estadisticas():
     """
     Endpoint AJAX para actualizar estadísticas sin recargar la página
-    
+
+    La respuesta se cachea 60s por usuario (el polling AJAX no re-agrega
+    en cada petición); las mutaciones de transacciones invalidan la clave.
+
     Returns:
         JSON con estadísticas actualizadas
     """
     try:
         estadisticas = current_user.get_estadisticas_resumen()
-        
-        return jsonify({
+
+        respuesta = jsonify({
             'success': True,
             'data': estadisticas
         })
-    
+        # Permitir que el navegador también cachee brevemente
+        respuesta.headers['Cache-Control'] = 'private, max-age=30'
+        return respuesta
+
     except Exception as e:
         logger.error(f"Error al actualizar estadísticas: {str(e)}")
         return jsonify({
@@ -330,21 +480,12 @@ def resumen_mes(mes, anio):
         
         # Obtener estadísticas del mes
         estadisticas = Transaccion.get_estadisticas_mes(current_user.id, mes, anio)
-        
-        # Obtener transacciones del mes
-        fecha_inicio, fecha_fin = obtener_rango_fechas_mes(mes, anio)
-        
-        transacciones = Transaccion.get_transacciones_por_periodo(
-            usuario_id=current_user.id,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin
-        )
-        
-        # Gastos por categoría
-        gastos_por_categoria = Transaccion.get_resumen_por_categoria(
+
+        # Gastos por categoría desde el agregado mensual
+        gastos_por_categoria = SaldoMensual.obtener_resumen_categorias(
             usuario_id=current_user.id,
-            fecha_inicio=fecha_inicio,
-            fecha_fin=fecha_fin,
+            anio=anio,
+            mes=mes,
             tipo='egreso'
         )
         
@@ -352,7 +493,7 @@ def resumen_mes(mes, anio):
             'success': True,
             'data': {
                 'estadisticas': estadisticas,
-                'num_transacciones': len(transacciones),
+                'num_transacciones': estadisticas['num_transacciones'],
                 'gastos_por_categoria': [
                     {
                         'nombre': nombre,
@@ -392,13 +533,16 @@ def perfil():
         # Fecha de registro
         dias_registrado = (datetime.now() - current_user.fecha_registro).days
         
-        # Total de transacciones
-        total_transacciones = current_user.transacciones.count()
-        
-        # Categorías personalizadas
-        categorias_personalizadas = Categoria.query.filter_by(
-            usuario_id=current_user.id
-        ).count()
+        # Contadores del perfil en un solo round trip: dos COUNT como
+        # subconsultas escalares de la misma sentencia
+        total_transacciones, categorias_personalizadas = db.session.query(
+            db.session.query(func.count(Transaccion.id)).filter(
+                Transaccion.usuario_id == current_user.id
+            ).scalar_subquery(),
+            db.session.query(func.count(Categoria.id)).filter(
+                Categoria.usuario_id == current_user.id
+            ).scalar_subquery()
+        ).one()
         
         # Actividad reciente
         logs_recientes = LogActividad.get_actividad_reciente(
@@ -445,31 +589,43 @@ def configuracion():
 def actualizar_configuracion():
     """
     Actualiza la configuración del usuario
+
+    Usa un upsert (INSERT ... ON DUPLICATE KEY UPDATE sobre el índice
+    único de usuario_id) en lugar de SELECT + INSERT/UPDATE vía ORM:
+    una sola sentencia cubre exista o no la fila de configuración.
     """
     try:
         data = request.get_json() if request.is_json else request.form
-        
-        config = current_user.configuracion
-        
-        if not config:
-            from app.models.usuario import ConfiguracionUsuario
-            config = ConfiguracionUsuario(usuario_id=current_user.id)
-            db.session.add(config)
-        
-        # Actualizar campos
+
+        from app.models.usuario import ConfiguracionUsuario, Usuario
+
+        # Recoger solo los campos presentes en la petición
+        campos = {}
         if 'notificaciones_email' in data:
-            config.notificaciones_email = data.get('notificaciones_email') == 'true' or data.get('notificaciones_email') == True
-        
+            campos['notificaciones_email'] = data.get('notificaciones_email') == 'true' or data.get('notificaciones_email') == True
+
         if 'tema' in data:
-            config.tema = data.get('tema')
-        
+            campos['tema'] = data.get('tema')
+
         if 'idioma' in data:
-            config.idioma = data.get('idioma')
-        
-        # Actualizar moneda preferida del usuario
+            campos['idioma'] = data.get('idioma')
+
+        if campos:
+            stmt = mysql_insert(ConfiguracionUsuario).values(
+                usuario_id=current_user.id, **campos
+            )
+            stmt = stmt.on_duplicate_key_update(**campos)
+            db.session.execute(stmt)
+
+        # Actualizar moneda preferida del usuario con un UPDATE directo
+        # (sin depender del flush de cambios del ORM)
         if 'moneda_preferida' in data:
-            current_user.moneda_preferida = data.get('moneda_preferida')
-        
+            db.session.execute(
+                db.update(Usuario)
+                .where(Usuario.id == current_user.id)
+                .values(moneda_preferida=data.get('moneda_preferida'))
+            )
+
         db.session.commit()
         
         registrar_actividad('actualizar_configuracion', 'Configuración actualizada')
@@ -590,11 +746,15 @@ def privacidad():
 
 @bp.route('/api/resumen-rapido')
 @login_required
+@con_etag_transacciones
+@cache.cached(timeout=60, key_prefix=lambda: cache_utils.CLAVE_RESUMEN_RAPIDO.format(current_user.id))
 def api_resumen_rapido():
     """
     Endpoint para obtener resumen rápido del usuario
     Útil para widgets o extensiones
-    
+
+    Respuesta cacheada 60s por usuario; se invalida al mutar transacciones.
+
     Returns:
         JSON con datos básicos
     """
@@ -609,7 +769,7 @@ def api_resumen_rapido():
             Transaccion.hora_transaccion.desc()
         ).first()
         
-        return jsonify({
+        respuesta = jsonify({
             'success': True,
             'data': {
                 'usuario': {
@@ -623,7 +783,9 @@ def api_resumen_rapido():
                 'ultima_transaccion': ultima_transaccion.to_dict() if ultima_transaccion else None
             }
         })
-    
+        respuesta.headers['Cache-Control'] = 'private, max-age=30'
+        return respuesta
+
     except Exception as e:
         logger.error(f"Error en resumen rápido: {str(e)}")
         return jsonify({
@@ -634,10 +796,15 @@ def api_resumen_rapido():
 
 @bp.route('/api/verificar-salud')
 @login_required
+@con_etag_transacciones
+@cache.cached(timeout=60, key_prefix=lambda: cache_utils.CLAVE_SALUD.format(current_user.id))
 def api_verificar_salud():
     """
     Verifica la salud financiera del usuario
-    
+
+    El payload completo se cachea 60s por usuario; las mutaciones de
+    transacciones y presupuestos invalidan la clave.
+
     Returns:
         JSON con análisis de salud financiera
     """
@@ -656,41 +823,62 @@ def api_verificar_salud():
                 'mensaje': 'Gastos superan ingresos este mes'
             })
         
-        # Verificar presupuestos excedidos
-        presupuestos_excedidos = [
-            p for p in Presupuesto.get_presupuestos_activos(current_user.id)
-            if p.esta_excedido()
-        ]
-        
-        if len(presupuestos_excedidos) > 0:
-            puntuacion -= 15 * len(presupuestos_excedidos)
+        # Los tres chequeos restantes se resuelven en un solo round trip:
+        # una sentencia con tres subconsultas escalares de COUNT
+        hoy = datetime.now().date()
+
+        # Presupuestos activos cuyo gasto del período supera el límite
+        gasto_presupuesto = db.session.query(
+            func.coalesce(func.sum(Transaccion.monto), 0)
+        ).filter(
+            Transaccion.usuario_id == Presupuesto.usuario_id,
+            Transaccion.categoria_id == Presupuesto.categoria_id,
+            Transaccion.tipo == 'egreso',
+            Transaccion.fecha_transaccion >= Presupuesto.fecha_inicio,
+            Transaccion.fecha_transaccion <= Presupuesto.fecha_fin
+        ).correlate(Presupuesto).scalar_subquery()
+
+        excedidos_sq = db.session.query(func.count(Presupuesto.id)).filter(
+            Presupuesto.usuario_id == current_user.id,
+            Presupuesto.fecha_inicio <= hoy,
+            Presupuesto.fecha_fin >= hoy,
+            gasto_presupuesto > Presupuesto.monto_limite
+        ).scalar_subquery()
+
+        # Metas atrasadas: get_estado() == 'atrasada' expresado en SQL
+        # (progreso de ahorro por debajo del progreso de tiempo, cruzado
+        # en multiplicación para evitar divisiones)
+        atrasadas_sq = db.session.query(func.count(MetaAhorro.id)).filter(
+            MetaAhorro.usuario_id == current_user.id,
+            MetaAhorro.completada == False,
+            MetaAhorro.fecha_objetivo > hoy,
+            MetaAhorro.monto_actual * func.datediff(MetaAhorro.fecha_objetivo, MetaAhorro.fecha_inicio) <
+            MetaAhorro.monto_objetivo * func.datediff(hoy, MetaAhorro.fecha_inicio)
+        ).scalar_subquery()
+
+        cuentas_sq = db.session.query(func.count(Cuenta.id)).filter(
+            Cuenta.usuario_id == current_user.id,
+            Cuenta.activo == True
+        ).scalar_subquery()
+
+        num_excedidos, num_metas_atrasadas, num_cuentas = db.session.query(
+            excedidos_sq, atrasadas_sq, cuentas_sq
+        ).one()
+
+        if num_excedidos > 0:
+            puntuacion -= 15 * num_excedidos
             alertas.append({
                 'tipo': 'danger',
-                'mensaje': f'{len(presupuestos_excedidos)} presupuesto(s) excedido(s)'
+                'mensaje': f'{num_excedidos} presupuesto(s) excedido(s)'
             })
-        
-        # Verificar metas atrasadas
-        metas_atrasadas = [
-            m for m in MetaAhorro.query.filter_by(
-                usuario_id=current_user.id,
-                completada=False
-            ).all()
-            if m.get_estado() == 'atrasada'
-        ]
-        
-        if len(metas_atrasadas) > 0:
+
+        if num_metas_atrasadas > 0:
             puntuacion -= 10
             alertas.append({
                 'tipo': 'warning',
-                'mensaje': f'{len(metas_atrasadas)} meta(s) de ahorro atrasada(s)'
+                'mensaje': f'{num_metas_atrasadas} meta(s) de ahorro atrasada(s)'
             })
-        
-        # Verificar diversificación de cuentas
-        num_cuentas = Cuenta.query.filter_by(
-            usuario_id=current_user.id,
-            activo=True
-        ).count()
-        
+
         if num_cuentas < 2:
             puntuacion -= 10
             alertas.append({
@@ -701,21 +889,13 @@ def api_verificar_salud():
         # Asegurar que la puntuación esté entre 0 y 100
         puntuacion = max(0, min(100, puntuacion))
         
-        # Determinar nivel de salud
-        if puntuacion >= 80:
-            nivel = 'excelente'
-            color = 'success'
-        elif puntuacion >= 60:
-            nivel = 'bueno'
-            color = 'info'
-        elif puntuacion >= 40:
-            nivel = 'regular'
-            color = 'warning'
-        else:
-            nivel = 'critico'
-            color = 'danger'
+        # Determinar nivel de salud según la tabla de umbrales
+        nivel, color = next(
+            (nombre, css) for umbral, nombre, css in NIVELES_SALUD
+            if puntuacion >= umbral
+        )
         
-        return jsonify({
+        respuesta = jsonify({
             'success': True,
             'data': {
                 'puntuacion': puntuacion,
@@ -724,7 +904,9 @@ def api_verificar_salud():
                 'alertas': alertas
             }
         })
-    
+        respuesta.headers['Cache-Control'] = 'private, max-age=30'
+        return respuesta
+
     except Exception as e:
         logger.error(f"Error al verificar salud financiera: {str(e)}")
         return jsonify({
@@ -737,48 +919,51 @@ def api_verificar_salud():
 @login_required
 def api_exportar_datos():
     """
-    Exporta los datos del usuario en formato JSON
-    
+    Exporta los datos del usuario como NDJSON (un objeto por línea)
+
+    La respuesta se emite en streaming: las transacciones se recorren con
+    yield_per en lugar de materializar todo el histórico en memoria, y
+    cada línea se serializa con orjson. Cada objeto lleva un campo 'tipo'
+    ('usuario', 'transaccion', 'cuenta', 'categoria', 'meta_ahorro').
+
     Returns:
-        JSON con todos los datos del usuario
+        Respuesta NDJSON en streaming con todos los datos del usuario
     """
-    try:
-        # Obtener todas las transacciones
-        transacciones = Transaccion.query.filter_by(
-            usuario_id=current_user.id
-        ).all()
-        
-        # Obtener todas las cuentas
-        cuentas = Cuenta.query.filter_by(
-            usuario_id=current_user.id
-        ).all()
-        
-        # Obtener categorías personalizadas
-        categorias = Categoria.query.filter_by(
-            usuario_id=current_user.id
-        ).all()
-        
-        # Obtener metas
-        metas = MetaAhorro.query.filter_by(
-            usuario_id=current_user.id
-        ).all()
-        
-        datos_exportacion = {
-            'usuario': current_user.to_dict(),
+    usuario_id = current_user.id
+
+    def generar():
+        yield orjson.dumps({
+            'tipo': 'usuario',
             'fecha_exportacion': datetime.now().isoformat(),
-            'transacciones': [t.to_dict() for t in transacciones],
-            'cuentas': [c.to_dict(incluir_estadisticas=True) for c in cuentas],
-            'categorias': [cat.to_dict() for cat in categorias],
-            'metas_ahorro': [m.to_dict() for m in metas]
-        }
-        
+            'datos': current_user.to_dict()
+        }) + b'\n'
+
+        transacciones = Transaccion.query.options(
+            selectinload(Transaccion.cuenta),
+            selectinload(Transaccion.categoria)
+        ).filter_by(usuario_id=usuario_id).yield_per(1000)
+
+        for t in transacciones:
+            yield orjson.dumps({'tipo': 'transaccion', 'datos': t.to_dict()}) + b'\n'
+
+        for c in Cuenta.query.filter_by(usuario_id=usuario_id).all():
+            yield orjson.dumps({'tipo': 'cuenta', 'datos': c.to_dict(incluir_estadisticas=True)}) + b'\n'
+
+        for cat in Categoria.query.filter_by(usuario_id=usuario_id).all():
+            yield orjson.dumps({'tipo': 'categoria', 'datos': cat.to_dict()}) + b'\n'
+
+        for m in MetaAhorro.query.filter_by(usuario_id=usuario_id).all():
+            yield orjson.dumps({'tipo': 'meta_ahorro', 'datos': m.to_dict()}) + b'\n'
+
+    try:
         registrar_actividad('exportar_datos', 'Datos exportados')
-        
-        return jsonify({
-            'success': True,
-            'data': datos_exportacion
-        })
-    
+
+        return Response(
+            stream_with_context(generar()),
+            mimetype='application/x-ndjson',
+            headers={'Content-Disposition': 'attachment; filename=exportacion_finanzas.ndjson'}
+        )
+
     except Exception as e:
         logger.error(f"Error al exportar datos: {str(e)}")
         return jsonify({
@@ -804,12 +989,13 @@ def notificaciones():
         # Obtener presupuestos en alerta
         presupuestos_alerta = Presupuesto.get_presupuestos_en_alerta(current_user.id)
         
-        # Obtener metas próximas a vencer
-        metas_proximas = MetaAhorro.query.filter_by(
-            usuario_id=current_user.id,
-            completada=False
-        ).all()
-        metas_proximas = [m for m in metas_proximas if m.get_dias_restantes() <= 30]
+        # Obtener metas próximas a vencer: el filtro de fecha se hace en
+        # SQL para traer solo las filas relevantes
+        metas_proximas = MetaAhorro.query.filter(
+            MetaAhorro.usuario_id == current_user.id,
+            MetaAhorro.completada == False,
+            MetaAhorro.fecha_objetivo <= datetime.now().date() + timedelta(days=30)
+        ).order_by(MetaAhorro.fecha_objetivo).all()
         
         return render_template('main/notificaciones.html',
                              consejos=consejos,
@@ -829,11 +1015,17 @@ def marcar_notificaciones_vistas():
     Marca todas las notificaciones como vistas
     """
     try:
-        # Marcar consejos como vistos
-        consejos = ConsejoFinanciero.get_consejos_no_vistos(current_user.id)
-        for consejo in consejos:
-            consejo.marcar_como_visto()
-        
+        # Un solo UPDATE masivo: no hace falta cargar los consejos para
+        # marcarlos (antes era un UPDATE + COMMIT por fila)
+        ConsejoFinanciero.query.filter(
+            db.or_(
+                ConsejoFinanciero.usuario_id == current_user.id,
+                ConsejoFinanciero.usuario_id == None
+            ),
+            ConsejoFinanciero.visto == False
+        ).update({'visto': True}, synchronize_session=False)
+        db.session.commit()
+
         return jsonify({
             'success': True,
             'message': 'Notificaciones marcadas como vistas'
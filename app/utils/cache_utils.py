@@ -0,0 +1,43 @@
+"""
+Utilidades de cache
+app/utils/cache_utils.py
+
+Claves y helpers de invalidación para los endpoints cacheados con
+Flask-Caching. Las claves son por usuario; los modelos que afectan las
+estadísticas (Transaccion, Presupuesto) invalidan desde sus listeners.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prefijos de clave por endpoint (siempre sufijados con el ID de usuario)
+CLAVE_ESTADISTICAS = 'stats:{}'
+CLAVE_RESUMEN_RAPIDO = 'resumen:{}'
+CLAVE_SALUD = 'salud:{}'
+# Memoización a nivel de método de Usuario.get_estadisticas_resumen
+CLAVE_RESUMEN_USUARIO = 'stats_resumen:{}'
+
+
+def invalidar_estadisticas_usuario(usuario_id):
+    """
+    Invalida las respuestas cacheadas de estadísticas de un usuario
+
+    Se llama desde los listeners de los modelos cuando cambia algo que
+    afecta los números del dashboard; así el TTL solo actúa como red de
+    seguridad y las mutaciones se reflejan de inmediato.
+
+    Args:
+        usuario_id (int): ID del usuario
+    """
+    from app import cache
+
+    try:
+        cache.delete_many(
+            CLAVE_ESTADISTICAS.format(usuario_id),
+            CLAVE_RESUMEN_RAPIDO.format(usuario_id),
+            CLAVE_SALUD.format(usuario_id),
+            CLAVE_RESUMEN_USUARIO.format(usuario_id)
+        )
+    except Exception as e:
+        logger.warning(f"No se pudo invalidar cache de usuario {usuario_id}: {str(e)}")
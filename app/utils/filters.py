@@ -1,234 +1,379 @@
 """
 Filtros personalizados para Jinja2
 app/utils/filters.py
+
+Los filtros viven a nivel de módulo (no como closures dentro de
+register_filters): una función plana no arrastra celdas de __closure__
+y su despacho es más barato en los filtros que se llaman miles de veces
+por render.
 """
 
+from bisect import bisect_right
 from datetime import datetime, date
+from functools import lru_cache
 import locale
 
-def register_filters(app):
+from flask import g
+
+# Nombres de mes en español, indexados por número de mes (constante de
+# módulo: evita reconstruir el diccionario en cada llamada del filtro)
+MESES_NOMBRES = (
+    '', 'Enero', 'Febrero', 'Marzo', 'Abril', 'Mayo', 'Junio',
+    'Julio', 'Agosto', 'Septiembre', 'Octubre', 'Noviembre', 'Diciembre'
+)
+
+# Umbrales (en segundos) y formatos de fecha_relativa: el bucket se
+# elige con una búsqueda binaria en C (bisect) en lugar de una escalera
+# de comparaciones en Python
+_UMBRALES_RELATIVOS = (60, 3600, 86400, 604800, 2592000, 31536000)
+_FORMATOS_RELATIVOS = (
+    None,  # < 60s: 'hace un momento'
+    (60, 'minuto', 'minutos'),
+    (3600, 'hora', 'horas'),
+    (86400, 'día', 'días'),
+    (604800, 'semana', 'semanas'),
+    (2592000, 'mes', 'meses'),
+    (31536000, 'año', 'años')
+)
+
+
+# Despacho por tipo exacto para formato_fecha: una sola búsqueda en
+# dict en lugar de tres isinstance por celda; SQLAlchemy devuelve
+# instancias exactas de datetime/date, así que el camino rápido aplica
+# en cada fila
+_DESPACHO_FECHA = {
+    datetime: datetime.strftime,
+    date: date.strftime
+}
+
+
+# Tablas de clases/iconos por tipo y estado (constantes de módulo: una
+# búsqueda de hash por llamada, sin construir dicts ni ramificar)
+_BADGES_ESTADO = {
+    'completada': 'badge-success',
+    'en_tiempo': 'badge-info',
+    'atrasada': 'badge-warning',
+    'vencida': 'badge-danger',
+    'excedido': 'badge-danger',
+    'alerta': 'badge-warning',
+    'normal': 'badge-success',
+    'inactivo': 'badge-secondary'
+}
+_CLASES_TIPO = {'ingreso': 'text-success'}
+_ICONOS_TIPO = {'ingreso': 'fa-arrow-up'}
+_SIGNOS_TIPO = {'ingreso': '+'}
+
+
+@lru_cache(maxsize=4096)
+def _parsear_iso(texto):
     """
-    Registra todos los filtros personalizados en la aplicación Flask
-    
+    Parsea una fecha ISO cacheando el resultado
+
+    El mismo timestamp suele repetirse muchas veces en una página (p. ej.
+    la columna de fecha de un listado): los aciertos del cache cuestan
+    una búsqueda en dict en lugar de un parseo completo.
+
     Args:
-        app: Instancia de la aplicación Flask
+        texto (str): Fecha en formato ISO
+
+    Returns:
+        datetime: Fecha parseada
     """
-    
-    @app.template_filter('formato_moneda')
-    def formato_moneda(valor, simbolo='$'):
-        """
-        Formatea un número como moneda
-        
-        Uso en template: {{ valor|formato_moneda }}
-        """
-        try:
-            return f'{simbolo}{float(valor):,.2f}'
-        except (ValueError, TypeError):
-            return f'{simbolo}0.00'
-    
-    @app.template_filter('formato_numero')
-    def formato_numero(valor):
-        """
-        Formatea un número con separadores de miles
-        
-        Uso en template: {{ valor|formato_numero }}
-        """
+    return datetime.fromisoformat(texto)
+
+
+def _intentar_parsear_iso(texto):
+    """
+    Parsea una fecha ISO devolviendo None si el texto no lo parece
+
+    La comprobación barata de forma (AAAA-MM-...) descarta los
+    centinelas habituales ('N/A', '-', 'Sin fecha') sin pagar el costo
+    de levantar y limpiar una excepción por celda.
+
+    Args:
+        texto (str): Texto a parsear
+
+    Returns:
+        datetime: Fecha parseada, o None si no es una fecha ISO
+    """
+    if len(texto) >= 10 and texto[4] == '-' and texto[7] == '-':
         try:
-            return f'{float(valor):,.2f}'
-        except (ValueError, TypeError):
-            return '0.00'
-    
-    @app.template_filter('formato_fecha')
-    def formato_fecha(fecha, formato='%d/%m/%Y'):
-        """
-        Formatea una fecha
-        
-        Uso en template: {{ fecha|formato_fecha }}
-        """
-        if not fecha:
-            return ''
-        
-        if isinstance(fecha, str):
-            try:
-                fecha = datetime.fromisoformat(fecha)
-            except:
-                return fecha
-        
-        if isinstance(fecha, datetime):
-            return fecha.strftime(formato)
-        elif isinstance(fecha, date):
-            return fecha.strftime(formato)
-        
-        return str(fecha)
-    
-    @app.template_filter('formato_fecha_hora')
-    def formato_fecha_hora(fecha_hora, formato='%d/%m/%Y %H:%M'):
-        """
-        Formatea una fecha y hora
-        
-        Uso en template: {{ fecha_hora|formato_fecha_hora }}
-        """
-        if not fecha_hora:
-            return ''
-        
+            return _parsear_iso(texto)
+        except ValueError:
+            return None
+    return None
+
+
+def formato_moneda(valor, simbolo='$'):
+    """
+    Formatea un número como moneda
+
+    Uso en template: {{ valor|formato_moneda }}
+    """
+    try:
+        # format() va directo al formateo en C sin reparsear la
+        # especificación del f-string en cada llamada
+        return simbolo + format(float(valor), ',.2f')
+    except (ValueError, TypeError):
+        return simbolo + '0.00'
+
+
+def formato_numero(valor):
+    """
+    Formatea un número con separadores de miles
+
+    Uso en template: {{ valor|formato_numero }}
+    """
+    try:
+        return format(float(valor), ',.2f')
+    except (ValueError, TypeError):
+        return '0.00'
+
+
+def formato_fecha(fecha, formato='%d/%m/%Y'):
+    """
+    Formatea una fecha
+
+    Uso en template: {{ fecha|formato_fecha }}
+    """
+    if not fecha:
+        return ''
+
+    manejador = _DESPACHO_FECHA.get(type(fecha))
+    if manejador is not None:
+        # Camino rápido para el formato por defecto: strftime
+        # reparsea el formato y resuelve locale en cada llamada
+        if formato == '%d/%m/%Y':
+            return f'{fecha.day:02}/{fecha.month:02}/{fecha.year}'
+        return manejador(fecha, formato)
+
+    if isinstance(fecha, str):
+        parseada = _intentar_parsear_iso(fecha)
+        if parseada is None:
+            return fecha
+        fecha = parseada
+
+    # Subclases de datetime/date (el despacho es por tipo exacto)
+    if isinstance(fecha, (datetime, date)):
+        return fecha.strftime(formato)
+
+    return str(fecha)
+
+
+def formato_fecha_hora(fecha_hora, formato='%d/%m/%Y %H:%M'):
+    """
+    Formatea una fecha y hora
+
+    Uso en template: {{ fecha_hora|formato_fecha_hora }}
+    """
+    if not fecha_hora:
+        return ''
+
+    # El caso común (datetime exacto desde la base de datos) primero:
+    # las filas de SQLAlchemy no deben pagar la rama de parseo de strings
+    if type(fecha_hora) is not datetime:
         if isinstance(fecha_hora, str):
-            try:
-                fecha_hora = datetime.fromisoformat(fecha_hora)
-            except:
+            parseada = _intentar_parsear_iso(fecha_hora)
+            if parseada is None:
                 return fecha_hora
-        
-        if isinstance(fecha_hora, datetime):
-            return fecha_hora.strftime(formato)
-        
-        return str(fecha_hora)
-    
-    @app.template_filter('fecha_relativa')
-    def fecha_relativa(fecha):
-        """
-        Convierte una fecha a formato relativo (hace 2 días, etc.)
-        
-        Uso en template: {{ fecha|fecha_relativa }}
-        """
-        if not fecha:
-            return ''
-        
+            fecha_hora = parseada
+
+    if isinstance(fecha_hora, datetime):
+        # Camino rápido para el formato por defecto (ver formato_fecha)
+        if formato == '%d/%m/%Y %H:%M':
+            return (f'{fecha_hora.day:02}/{fecha_hora.month:02}/{fecha_hora.year} '
+                    f'{fecha_hora.hour:02}:{fecha_hora.minute:02}')
+        return fecha_hora.strftime(formato)
+
+    return str(fecha_hora)
+
+
+def fecha_relativa(fecha):
+    """
+    Convierte una fecha a formato relativo (hace 2 días, etc.)
+
+    Uso en template: {{ fecha|fecha_relativa }}
+    """
+    if not fecha:
+        return ''
+
+    # Caso común (datetime exacto) primero; ver formato_fecha_hora
+    if type(fecha) is not datetime:
         if isinstance(fecha, str):
-            try:
-                fecha = datetime.fromisoformat(fecha)
-            except:
+            parseada = _intentar_parsear_iso(fecha)
+            if parseada is None:
                 return fecha
-        
+            fecha = parseada
+
         if isinstance(fecha, date) and not isinstance(fecha, datetime):
             fecha = datetime.combine(fecha, datetime.min.time())
-        
+
+    try:
+        ahora = g._ahora
+    except (RuntimeError, AttributeError):
+        # Fuera de una petición (o antes del before_request)
         ahora = datetime.now()
-        diferencia = ahora - fecha
-        
-        segundos = diferencia.total_seconds()
-        
-        if segundos < 60:
-            return 'hace un momento'
-        elif segundos < 3600:
-            minutos = int(segundos / 60)
-            return f'hace {minutos} minuto{"s" if minutos > 1 else ""}'
-        elif segundos < 86400:
-            horas = int(segundos / 3600)
-            return f'hace {horas} hora{"s" if horas > 1 else ""}'
-        elif segundos < 604800:
-            dias = int(segundos / 86400)
-            return f'hace {dias} día{"s" if dias > 1 else ""}'
-        elif segundos < 2592000:
-            semanas = int(segundos / 604800)
-            return f'hace {semanas} semana{"s" if semanas > 1 else ""}'
-        elif segundos < 31536000:
-            meses = int(segundos / 2592000)
-            return f'hace {meses} mes{"es" if meses > 1 else ""}'
-        else:
-            anos = int(segundos / 31536000)
-            return f'hace {anos} año{"s" if anos > 1 else ""}'
-    
-    @app.template_filter('porcentaje')
-    def formato_porcentaje(valor, decimales=1):
-        """
-        Formatea un número como porcentaje
-        
-        Uso en template: {{ valor|porcentaje }}
-        """
-        try:
-            return f'{float(valor):.{decimales}f}%'
-        except (ValueError, TypeError):
-            return '0.0%'
-    
-    @app.template_filter('mes_nombre')
-    def mes_nombre(numero_mes):
-        """
-        Convierte el número de mes a nombre
-        
-        Uso en template: {{ 1|mes_nombre }} -> Enero
-        """
-        meses = {
-            1: 'Enero', 2: 'Febrero', 3: 'Marzo', 4: 'Abril',
-            5: 'Mayo', 6: 'Junio', 7: 'Julio', 8: 'Agosto',
-            9: 'Septiembre', 10: 'Octubre', 11: 'Noviembre', 12: 'Diciembre'
-        }
-        return meses.get(numero_mes, '')
-    
-    @app.template_filter('truncar')
-    def truncar_texto(texto, longitud=50, sufijo='...'):
-        """
-        Trunca un texto a una longitud específica
-        
-        Uso en template: {{ texto|truncar(30) }}
-        """
-        if not texto:
-            return ''
-        
+    diferencia = ahora - fecha
+
+    segundos = int(diferencia.total_seconds())
+
+    indice = bisect_right(_UMBRALES_RELATIVOS, segundos)
+    if indice == 0:
+        return 'hace un momento'
+
+    divisor, singular, plural = _FORMATOS_RELATIVOS[indice]
+    valor = segundos // divisor
+    return f'hace {valor} {plural if valor > 1 else singular}'
+
+
+def formato_porcentaje(valor, decimales=1):
+    """
+    Formatea un número como porcentaje
+
+    Uso en template: {{ valor|porcentaje }}
+    """
+    try:
+        # Caso común (1 decimal) con especificación fija precompilada
+        if decimales == 1:
+            return format(float(valor), '.1f') + '%'
+        return format(float(valor), f'.{decimales}f') + '%'
+    except (ValueError, TypeError):
+        return '0.0%'
+
+
+def mes_nombre(numero_mes):
+    """
+    Convierte el número de mes a nombre
+
+    Uso en template: {{ 1|mes_nombre }} -> Enero
+    """
+    if isinstance(numero_mes, int) and 1 <= numero_mes <= 12:
+        return MESES_NOMBRES[numero_mes]
+    return ''
+
+
+def truncar_texto(texto, longitud=50, sufijo='...'):
+    """
+    Trunca un texto a una longitud específica
+
+    Uso en template: {{ texto|truncar(30) }}
+    """
+    if not texto:
+        return ''
+
+    # Evitar la copia de str(texto) cuando ya es una cadena
+    if not isinstance(texto, str):
         texto = str(texto)
-        if len(texto) <= longitud:
-            return texto
-        
-        return texto[:longitud].rsplit(' ', 1)[0] + sufijo
-    
-    @app.template_filter('clase_tipo_transaccion')
-    def clase_tipo_transaccion(tipo):
-        """
-        Retorna la clase CSS según el tipo de transacción
-        
-        Uso en template: {{ tipo|clase_tipo_transaccion }}
-        """
-        return 'text-success' if tipo == 'ingreso' else 'text-danger'
-    
-    @app.template_filter('icono_tipo_transaccion')
-    def icono_tipo_transaccion(tipo):
-        """
-        Retorna el icono según el tipo de transacción
-        
-        Uso en template: {{ tipo|icono_tipo_transaccion }}
-        """
-        return 'fa-arrow-up' if tipo == 'ingreso' else 'fa-arrow-down'
-    
-    @app.template_filter('signo_monto')
-    def signo_monto(tipo):
-        """
-        Retorna el signo según el tipo de transacción
-        
-        Uso en template: {{ tipo|signo_monto }}
-        """
-        return '+' if tipo == 'ingreso' else '-'
-    
-    @app.template_filter('initials')
-    def obtener_iniciales(nombre):
-        """
-        Obtiene las iniciales de un nombre
-        
-        Uso en template: {{ nombre|initials }}
-        """
-        if not nombre:
-            return ''
-        
-        palabras = nombre.strip().split()
-        if len(palabras) == 0:
-            return ''
-        elif len(palabras) == 1:
-            return palabras[0][0].upper()
-        else:
-            return (palabras[0][0] + palabras[-1][0]).upper()
-    
-    @app.template_filter('estado_badge')
-    def estado_badge(estado):
-        """
-        Retorna la clase de badge según el estado
-        
-        Uso en template: {{ estado|estado_badge }}
-        """
-        clases = {
-            'completada': 'badge-success',
-            'en_tiempo': 'badge-info',
-            'atrasada': 'badge-warning',
-            'vencida': 'badge-danger',
-            'excedido': 'badge-danger',
-            'alerta': 'badge-warning',
-            'normal': 'badge-success',
-            'inactivo': 'badge-secondary'
-        }
-        return clases.get(estado, 'badge-secondary')
\ No newline at end of file
+    if len(texto) <= longitud:
+        return texto
+
+    # rfind en lugar de slice + rsplit: un solo barrido, sin lista
+    corte = texto.rfind(' ', 0, longitud)
+    if corte == -1:
+        return texto[:longitud] + sufijo
+    return texto[:corte] + sufijo
+
+
+def clase_tipo_transaccion(tipo):
+    """
+    Retorna la clase CSS según el tipo de transacción
+
+    Uso en template: {{ tipo|clase_tipo_transaccion }}
+    """
+    return _CLASES_TIPO.get(tipo, 'text-danger')
+
+
+def icono_tipo_transaccion(tipo):
+    """
+    Retorna el icono según el tipo de transacción
+
+    Uso en template: {{ tipo|icono_tipo_transaccion }}
+    """
+    return _ICONOS_TIPO.get(tipo, 'fa-arrow-down')
+
+
+def signo_monto(tipo):
+    """
+    Retorna el signo según el tipo de transacción
+
+    Uso en template: {{ tipo|signo_monto }}
+    """
+    return _SIGNOS_TIPO.get(tipo, '-')
+
+
+def obtener_iniciales(nombre):
+    """
+    Obtiene las iniciales de un nombre
+
+    Uso en template: {{ nombre|initials }}
+    """
+    if not nombre:
+        return ''
+
+    # Solo se usan la primera y la última palabra: localizar sus
+    # primeras letras con barridos de índice, sin strip().split()
+    # (que materializa la lista completa de palabras)
+    n = len(nombre)
+    i = 0
+    while i < n and nombre[i].isspace():
+        i += 1
+    if i == n:
+        return ''
+
+    j = n - 1
+    while nombre[j].isspace():
+        j -= 1
+    m = j
+    while m > i and not nombre[m - 1].isspace():
+        m -= 1
+
+    if m <= i:
+        return nombre[i].upper()
+    return (nombre[i] + nombre[m]).upper()
+
+
+def estado_badge(estado):
+    """
+    Retorna la clase de badge según el estado
+
+    Uso en template: {{ estado|estado_badge }}
+    """
+    return _BADGES_ESTADO.get(estado, 'badge-secondary')
+
+
+# Mapa nombre-de-filtro -> función (el nombre en plantilla no siempre
+# coincide con el de la función, p. ej. 'porcentaje' e 'initials')
+_FILTROS = (
+    ('formato_moneda', formato_moneda),
+    ('formato_numero', formato_numero),
+    ('formato_fecha', formato_fecha),
+    ('formato_fecha_hora', formato_fecha_hora),
+    ('fecha_relativa', fecha_relativa),
+    ('porcentaje', formato_porcentaje),
+    ('mes_nombre', mes_nombre),
+    ('truncar', truncar_texto),
+    ('clase_tipo_transaccion', clase_tipo_transaccion),
+    ('icono_tipo_transaccion', icono_tipo_transaccion),
+    ('signo_monto', signo_monto),
+    ('initials', obtener_iniciales),
+    ('estado_badge', estado_badge)
+)
+
+
+def register_filters(app):
+    """
+    Registra todos los filtros personalizados en la aplicación Flask
+
+    Args:
+        app: Instancia de la aplicación Flask
+    """
+
+    @app.before_request
+    def _cachear_ahora():
+        # Un solo datetime.now() por petición: todas las filas de un
+        # listado comparten el mismo "ahora" (y el tiempo relativo queda
+        # consistente dentro de la página)
+        g._ahora = datetime.now()
+
+    for nombre, funcion in _FILTROS:
+        app.add_template_filter(funcion, nombre)
@@ -0,0 +1,42 @@
+"""
+Proveedor JSON basado en orjson
+app/utils/json_provider.py
+
+Reemplaza el provider por defecto de Flask (json puro Python) por
+orjson, implementado en C: serializa datetime/date de forma nativa y es
+varias veces más rápido en los endpoints JSON sin cambiar ningún
+call-site de jsonify.
+"""
+
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+
+
+def _default(obj):
+    """Serializa los tipos que orjson no maneja de forma nativa"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f'Tipo no serializable a JSON: {type(obj).__name__}')
+
+
+class OrjsonProvider(JSONProvider):
+    """Provider de Flask que delega en orjson"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Responder directamente los bytes de orjson sin el decode/encode
+        # intermedio del response() por defecto
+        obj = self._prepare_response_obj(args, kwargs)
+        cuerpo = orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(cuerpo, mimetype='application/json')
@@ -0,0 +1,133 @@
+"""
+Buffer de escritura para el log de actividad
+app/utils/log_buffer.py
+
+Los registros de auditoría no necesitan ser durables antes de responder
+la petición HTTP. En lugar de un INSERT + COMMIT por evento en el camino
+crítico, los eventos se encolan en memoria y un hilo de fondo los vuelca
+en lotes a la base de datos.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Cola acotada: si se llena (base de datos caída, ráfaga extrema) se
+# descartan eventos en lugar de bloquear las peticiones
+_cola = queue.Queue(maxsize=10000)
+
+# Parámetros de volcado
+_INTERVALO_FLUSH = 0.1   # segundos de espera máxima entre volcados
+_TAMANO_LOTE = 50        # volcar inmediatamente al acumular este tamaño
+
+_hilo = None
+_detener = threading.Event()
+
+
+def encolar(usuario_id, accion, detalle=None, ip_address=None):
+    """
+    Encola un evento de actividad para escritura diferida
+
+    Args:
+        usuario_id (int): ID del usuario
+        accion (str): Acción realizada
+        detalle (str): Detalles adicionales
+        ip_address (str): Dirección IP
+    """
+    try:
+        _cola.put_nowait({
+            'usuario_id': usuario_id,
+            'accion': accion,
+            'detalle': detalle,
+            'ip_address': ip_address,
+            'fecha_hora': datetime.utcnow()
+        })
+    except queue.Full:
+        logger.warning("Cola de log de actividad llena, evento descartado")
+
+
+def _drenar_lote():
+    """
+    Extrae de la cola un lote de eventos pendientes
+
+    Returns:
+        list: Lista de diccionarios listos para insertar
+    """
+    lote = []
+    while len(lote) < _TAMANO_LOTE * 10:
+        try:
+            lote.append(_cola.get_nowait())
+        except queue.Empty:
+            break
+    return lote
+
+
+def _volcar(app, lote):
+    """
+    Inserta un lote de eventos en una sola sentencia
+
+    Usa el insert de Core con lista de diccionarios: SQLAlchemy emite un
+    INSERT multi-fila (insertmanyvalues) en lugar de un statement por
+    evento, reduciendo round-trips y costo de parseo en el servidor.
+
+    Args:
+        app: Instancia de la aplicación Flask
+        lote (list): Eventos a insertar
+    """
+    from app import db
+    from app.models.otros import LogActividad
+
+    try:
+        with app.app_context():
+            db.session.execute(LogActividad.__table__.insert(), lote)
+            db.session.commit()
+    except Exception as e:
+        logger.error(f"Error al volcar log de actividad: {str(e)}")
+
+
+def _bucle_flusher(app):
+    """Bucle del hilo de fondo: drena y vuelca la cola periódicamente"""
+    while not _detener.is_set():
+        # Esperar hasta el intervalo o hasta que el lote se llene
+        _detener.wait(_INTERVALO_FLUSH if _cola.qsize() < _TAMANO_LOTE else 0)
+
+        lote = _drenar_lote()
+        if lote:
+            _volcar(app, lote)
+
+
+def iniciar(app):
+    """
+    Arranca el hilo de volcado (llamado desde create_app)
+
+    Args:
+        app: Instancia de la aplicación Flask
+    """
+    global _hilo
+
+    if _hilo is not None and _hilo.is_alive():
+        return
+
+    _detener.clear()
+    _hilo = threading.Thread(
+        target=_bucle_flusher,
+        args=(app,),
+        name='log-actividad-flusher',
+        daemon=True
+    )
+    _hilo.start()
+
+    # Al apagar el proceso, volcar lo que quede en la cola
+    atexit.register(_finalizar, app)
+
+
+def _finalizar(app):
+    """Detiene el hilo y vuelca los eventos pendientes"""
+    _detener.set()
+    lote = _drenar_lote()
+    if lote:
+        _volcar(app, lote)
@@ -5,15 +5,49 @@ import logging
 from logging.handlers import RotatingFileHandler
 import os
 
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler con escritura buffereada
+
+    El handler estándar hace flush (y por tanto un write() al sistema)
+    por cada registro. Este abre el archivo con un buffer amplio y solo
+    fuerza el volcado en WARNING o superior, amortizando el costo del
+    syscall entre muchos registros INFO.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # delay=True: no abrir el archivo hasta el primer registro
+        kwargs.setdefault('delay', True)
+        self._forzar_flush = True
+        super().__init__(*args, **kwargs)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding)
+
+    def flush(self):
+        if self._forzar_flush:
+            super().flush()
+
+    def emit(self, record):
+        self._forzar_flush = record.levelno >= logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._forzar_flush = True
+
+
 def setup_logging(app):
     """Configura el sistema de logging"""
     if not app.debug:
         # Crear carpeta de logs si no existe
         if not os.path.exists('logs'):
             os.mkdir('logs')
-        
-        # Handler para archivo
-        file_handler = RotatingFileHandler(
+
+        # Handler para archivo (buffereado; logging.shutdown vuelca lo
+        # pendiente al terminar el proceso)
+        file_handler = BufferedRotatingFileHandler(
             'logs/finanzas.log',
             maxBytes=10240000,  # 10MB
             backupCount=10
@@ -24,6 +58,6 @@ def setup_logging(app):
         ))
         file_handler.setLevel(logging.INFO)
         app.logger.addHandler(file_handler)
-        
+
         app.logger.setLevel(logging.INFO)
-        app.logger.info('Aplicación de Finanzas Personales iniciada')
\ No newline at end of file
+        app.logger.info('Aplicación de Finanzas Personales iniciada')
@@ -0,0 +1,48 @@
+"""
+Ejecución de consultas en paralelo
+app/utils/parallel.py
+
+El dashboard emite varias consultas de solo lectura independientes entre
+sí; ejecutarlas en serie suma sus latencias. Este helper las reparte en
+un ThreadPoolExecutor donde cada hilo trabaja con su propio app context
+(y por tanto su propia sesión/conexión), de modo que la latencia total
+se acerca a la de la consulta más lenta.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+
+def ejecutar_consultas(consultas, max_workers=6):
+    """
+    Ejecuta un conjunto de consultas de solo lectura en paralelo
+
+    Cada callable corre dentro de su propio app context, con una sesión
+    independiente que se libera al terminar; los objetos devueltos quedan
+    desconectados pero con sus atributos ya cargados (usar eager loading
+    para lo que vaya a leerse después).
+
+    Args:
+        consultas (dict): Mapa nombre -> callable sin argumentos
+
+    Returns:
+        dict: Mapa nombre -> resultado de cada consulta
+    """
+    from app import db
+
+    app = current_app._get_current_object()
+
+    def _en_contexto(fn):
+        with app.app_context():
+            try:
+                return fn()
+            finally:
+                db.session.remove()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futuros = {
+            nombre: executor.submit(_en_contexto, fn)
+            for nombre, fn in consultas.items()
+        }
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
@@ -0,0 +1,121 @@
+"""
+Precálculo de estadísticas en segundo plano
+app/utils/precalculo.py
+
+Tras una mutación de transacciones el cache de estadísticas del usuario
+queda invalidado y la siguiente visita al dashboard paga el costo de
+recalcularlo. Este módulo encola el ID del usuario y un hilo de fondo
+recalcula el resumen fuera del ciclo petición/respuesta, de modo que el
+dashboard casi siempre encuentra el cache caliente.
+"""
+
+import logging
+import queue
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Cola acotada de usuarios pendientes de recalcular; si se llena, el
+# usuario simplemente recalculará en su próxima petición
+_cola = queue.Queue(maxsize=1000)
+
+# Breve espera antes de recalcular: agrupa ráfagas de mutaciones del
+# mismo usuario y da tiempo a que la transacción en curso haga commit
+_ESPERA_AGRUPACION = 0.5
+
+_hilo = None
+_detener = threading.Event()
+
+
+def encolar(usuario_id):
+    """
+    Solicita el recálculo en segundo plano de las estadísticas de un usuario
+
+    Args:
+        usuario_id (int): ID del usuario
+    """
+    try:
+        _cola.put_nowait(usuario_id)
+    except queue.Full:
+        pass
+
+
+def _drenar_pendientes():
+    """
+    Extrae de la cola el conjunto de usuarios pendientes (sin duplicados)
+
+    Returns:
+        set: IDs de usuario a recalcular
+    """
+    pendientes = set()
+    while True:
+        try:
+            pendientes.add(_cola.get_nowait())
+        except queue.Empty:
+            break
+    return pendientes
+
+
+def _recalcular(app, usuario_id):
+    """
+    Recalcula y cachea el resumen de estadísticas de un usuario
+
+    Args:
+        app: Instancia de la aplicación Flask
+        usuario_id (int): ID del usuario
+    """
+    from app import db
+    from app.models.usuario import Usuario
+
+    try:
+        with app.app_context():
+            try:
+                usuario = db.session.get(Usuario, usuario_id)
+                if usuario is not None:
+                    # Escribe a través del cache (ver get_estadisticas_resumen)
+                    usuario.get_estadisticas_resumen()
+            finally:
+                db.session.remove()
+    except Exception as e:
+        logger.warning(f"No se pudo precalcular estadísticas de usuario {usuario_id}: {str(e)}")
+
+
+def _bucle_trabajador(app):
+    """Bucle del hilo de fondo: agrupa y recalcula usuarios pendientes"""
+    while not _detener.is_set():
+        try:
+            usuario_id = _cola.get(timeout=1)
+        except queue.Empty:
+            continue
+
+        _detener.wait(_ESPERA_AGRUPACION)
+
+        pendientes = _drenar_pendientes()
+        pendientes.add(usuario_id)
+
+        for uid in pendientes:
+            if _detener.is_set():
+                break
+            _recalcular(app, uid)
+
+
+def iniciar(app):
+    """
+    Arranca el hilo de precálculo (llamado desde create_app)
+
+    Args:
+        app: Instancia de la aplicación Flask
+    """
+    global _hilo
+
+    if _hilo is not None and _hilo.is_alive():
+        return
+
+    _detener.clear()
+    _hilo = threading.Thread(
+        target=_bucle_trabajador,
+        args=(app,),
+        name='estadisticas-precalculo',
+        daemon=True
+    )
+    _hilo.start()
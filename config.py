@@ -26,10 +26,16 @@ class Config:
         'mysql+pymysql://root:@localhost/finanzas_personales'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False  # True para ver queries SQL en consola
-    SQLALCHEMY_POOL_SIZE = 10
-    SQLALCHEMY_POOL_TIMEOUT = 30
-    SQLALCHEMY_POOL_RECYCLE = 3600
-    SQLALCHEMY_MAX_OVERFLOW = 20
+    # Opciones del pool de conexiones (las claves SQLALCHEMY_POOL_* de
+    # nivel superior están obsoletas en Flask-SQLAlchemy moderno);
+    # pre_ping descarta conexiones muertas sin estancar la petición
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_size': 10,
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'max_overflow': 20
+    }
     
     # ==========================================
     # CONFIGURACIÓN DE SESIONES
@@ -48,12 +54,10 @@ class Config:
     # ==========================================
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_FILE_SIZE', 16 * 1024 * 1024))  # 16MB
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER') or os.path.join(basedir, 'uploads')
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'pdf', 'gif', 'xlsx', 'csv'}
-    
-    # Asegurar que la carpeta de uploads existe
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-    
+    # frozenset: conjunto inmutable construido una sola vez al cargar la
+    # configuración; la prueba de pertenencia es un único probe de hash
+    ALLOWED_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'pdf', 'gif', 'xlsx', 'csv'})
+
     # ==========================================
     # CONFIGURACIÓN DE PAGINACIÓN
     # ==========================================
@@ -63,7 +67,9 @@ class Config:
     # ==========================================
     # CONFIGURACIÓN DE SEGURIDAD
     # ==========================================
-    BCRYPT_LOG_ROUNDS = 12
+    # Costo de bcrypt configurable por entorno: permite ajustar el tiempo
+    # de CPU por hash (~100-300ms con 12 rondas) según la máquina destino
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None  # Sin límite de tiempo para CSRF
     WTF_CSRF_SSL_STRICT = False  # True en producción con HTTPS
@@ -97,8 +103,11 @@ class Config:
     # ==========================================
     # CONFIGURACIÓN DE CACHE
     # ==========================================
-    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'simple')
+    # SimpleCache (en memoria, por proceso) por defecto; en producción
+    # con varios workers usar RedisCache vía variables de entorno
+    CACHE_TYPE = os.environ.get('CACHE_TYPE', 'SimpleCache')
     CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
     
     # ==========================================
     # CONFIGURACIÓN DE RATE LIMITING
@@ -114,18 +123,12 @@ class Config:
     BACKUP_FOLDER = os.environ.get('BACKUP_FOLDER') or os.path.join(basedir, 'backups')
     AUTO_BACKUP_ENABLED = os.environ.get('AUTO_BACKUP_ENABLED', 'False').lower() == 'true'
     BACKUP_RETENTION_DAYS = int(os.environ.get('BACKUP_RETENTION_DAYS', 30))
-    
-    # Asegurar que la carpeta de backups existe
-    if not os.path.exists(BACKUP_FOLDER):
-        os.makedirs(BACKUP_FOLDER)
-    
+
     # ==========================================
     # CONFIGURACIÓN DE REPORTES
     # ==========================================
     REPORTS_FOLDER = os.path.join(basedir, 'reports')
-    if not os.path.exists(REPORTS_FOLDER):
-        os.makedirs(REPORTS_FOLDER)
-    
+
     # ==========================================
     # CONFIGURACIÓN DE API EXTERNA (FUTURO)
     # ==========================================
@@ -150,24 +153,35 @@ class Config:
     @staticmethod
     def init_app(app):
         """Inicialización de la configuración"""
-        # Crear carpetas necesarias
+        # Crear carpetas necesarias (una sola vez al arrancar; exist_ok
+        # evita el par stat + mkdir por carpeta)
         folders = [
             app.config['UPLOAD_FOLDER'],
             app.config['BACKUP_FOLDER'],
             app.config['REPORTS_FOLDER'],
             os.path.join(basedir, 'logs')
         ]
-        
+
         for folder in folders:
-            if not os.path.exists(folder):
-                os.makedirs(folder)
+            os.makedirs(folder, exist_ok=True)
+
+        # Cache de bytecode de Jinja: las plantillas compiladas se
+        # reutilizan entre procesos/arranques en lugar de recompilarse
+        # en la primera petición de cada worker
+        from jinja2 import FileSystemBytecodeCache
+
+        jinja_cache_dir = os.path.join(basedir, '.jinja_cache')
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory=jinja_cache_dir)
 
 
 class DevelopmentConfig(Config):
     """Configuración para desarrollo"""
     DEBUG = True
     TESTING = False
-    SQLALCHEMY_ECHO = True  # Ver queries en desarrollo
+    # El echo de SQL pasa cada sentencia por los formatters de logging;
+    # activarlo solo bajo demanda con SQL_ECHO=1
+    SQLALCHEMY_ECHO = os.environ.get('SQL_ECHO', '').lower() in ('1', 'true')
     
     # Seguridad relajada en desarrollo
     WTF_CSRF_ENABLED = True  # Mantener CSRF incluso en dev
@@ -195,6 +209,9 @@ class ProductionConfig(Config):
     # Configuración de logging para producción
     LOG_TO_STDOUT = True
     LOG_LEVEL = 'WARNING'
+
+    # No vigilar cambios en plantillas en producción
+    TEMPLATES_AUTO_RELOAD = False
     
     # Habilitar backups automáticos en producción
     AUTO_BACKUP_ENABLED = True
@@ -211,13 +228,24 @@ class ProductionConfig(Config):
         if not cls.SQLALCHEMY_DATABASE_URI or 'localhost' in cls.SQLALCHEMY_DATABASE_URI:
             raise ValueError("❌ DATABASE_URL no configurada para producción")
         
-        # Logging para syslog en producción
+        # Logging para syslog en producción, desacoplado de la petición:
+        # los registros van a una cola en memoria y un hilo de fondo
+        # (QueueListener) hace el syscall hacia syslog, de modo que un
+        # socket congestionado o ausente no bloquea los handlers HTTP
         import logging
-        from logging.handlers import SysLogHandler
-        
+        import queue
+        from logging.handlers import QueueHandler, QueueListener, SysLogHandler
+
         syslog_handler = SysLogHandler()
         syslog_handler.setLevel(logging.WARNING)
-        app.logger.addHandler(syslog_handler)
+
+        cola_logs = queue.Queue(-1)
+        queue_handler = QueueHandler(cola_logs)
+        queue_handler.setLevel(logging.WARNING)
+        app.logger.addHandler(queue_handler)
+
+        listener = QueueListener(cola_logs, syslog_handler, respect_handler_level=True)
+        listener.start()
 
 
 class TestingConfig(Config):
@@ -228,7 +256,11 @@ class TestingConfig(Config):
     # Base de datos de prueba separada
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or \
         'mysql+pymysql://root:@localhost/finanzas_personales_test'
-    
+
+    # Sin opciones de QueuePool: TEST_DATABASE_URL suele apuntar a
+    # SQLite, cuyo pool rechaza pool_size/max_overflow en create_engine
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
+
     # Deshabilitar CSRF en tests
     WTF_CSRF_ENABLED = False
     
@@ -236,7 +268,7 @@ class TestingConfig(Config):
     MAIL_SUPPRESS_SEND = True
     
     # Cache deshabilitado en tests
-    CACHE_TYPE = 'null'
+    CACHE_TYPE = 'NullCache'
     
     # Rate limiting deshabilitado en tests
     RATELIMIT_ENABLED = False
@@ -30,10 +30,8 @@ def drop_db():
 def seed_db():
     """Llena la base de datos con datos de prueba"""
     from app.models.usuario import Usuario
-    from app.models.categoria import Categoria
     from app.models.cuenta import Cuenta
-    from datetime import datetime
-    
+
     # Verificar si ya hay datos
     if Usuario.query.first():
         print("⚠️ La base de datos ya contiene datos")
@@ -67,7 +65,11 @@ def seed_db():
 
 @app.shell_context_processor
 def make_shell_context():
-    """Crea un contexto para el shell interactivo de Flask"""
+    """Crea un contexto para el shell interactivo de Flask
+
+    Los imports son locales a propósito: solo se pagan al entrar al
+    shell, nunca en los workers que sirven tráfico.
+    """
     from app.models.usuario import Usuario
     from app.models.categoria import Categoria
     from app.models.cuenta import Cuenta
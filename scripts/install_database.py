@@ -8,10 +8,76 @@ import mysql.connector
 from mysql.connector import Error
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Agregar el directorio raíz al path para importar los modelos
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Categorías semilla (nombre, tipo, color, icono): constante de módulo
+# interneada en el .pyc; los diccionarios solo se materializan en la
+# rama que realmente inserta
+_CATEGORIAS_SEMILLA = (
+    # Egresos
+    ('Alimentación', 'egreso', '#e74c3c', 'fa-utensils'),
+    ('Transporte', 'egreso', '#3498db', 'fa-car'),
+    ('Vivienda', 'egreso', '#9b59b6', 'fa-home'),
+    ('Servicios', 'egreso', '#f39c12', 'fa-bolt'),
+    ('Salud', 'egreso', '#1abc9c', 'fa-heartbeat'),
+    ('Educación', 'egreso', '#2ecc71', 'fa-graduation-cap'),
+    ('Entretenimiento', 'egreso', '#e67e22', 'fa-gamepad'),
+    ('Ropa', 'egreso', '#95a5a6', 'fa-tshirt'),
+    ('Tecnología', 'egreso', '#34495e', 'fa-laptop'),
+    ('Otros Gastos', 'egreso', '#7f8c8d', 'fa-ellipsis-h'),
+    # Ingresos
+    ('Salario', 'ingreso', '#27ae60', 'fa-money-bill-wave'),
+    ('Freelance', 'ingreso', '#16a085', 'fa-briefcase'),
+    ('Inversiones', 'ingreso', '#2980b9', 'fa-chart-line'),
+    ('Bonos', 'ingreso', '#8e44ad', 'fa-gift'),
+    ('Otros Ingresos', 'ingreso', '#95a5a6', 'fa-plus-circle'),
+)
+
+
+def crear_tablas_en_paralelo(db, max_workers=4):
+    """
+    Crea las tablas del metadata por niveles de dependencia en paralelo
+
+    Cada CREATE TABLE está limitado por latencia, no por CPU: las tablas
+    que no dependen entre sí (sin FK pendientes) se crean a la vez sobre
+    conexiones distintas del pool, nivel por nivel.
+
+    Debe llamarse dentro de un app context; el engine se resuelve aquí
+    una sola vez porque los hilos del executor no tienen contexto y
+    db.engine les lanzaría RuntimeError.
+
+    Args:
+        db: Instancia de SQLAlchemy con el metadata de la aplicación
+        max_workers (int): Conexiones simultáneas para el DDL
+    """
+    engine = db.engine
+    pendientes = list(db.metadata.sorted_tables)
+    creadas = set()
+
+    while pendientes:
+        nivel = [
+            tabla for tabla in pendientes
+            if all(fk.column.table.name in creadas or fk.column.table is tabla
+                   for fk in tabla.foreign_keys)
+        ]
+        if not nivel:
+            # Ciclo de FKs: caer al orden secuencial de sorted_tables
+            nivel = [pendientes[0]]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() propaga cualquier excepción del DDL
+            list(executor.map(
+                lambda tabla: tabla.create(bind=engine, checkfirst=True),
+                nivel
+            ))
+
+        creadas.update(tabla.name for tabla in nivel)
+        pendientes = [tabla for tabla in pendientes if tabla.name not in creadas]
+
+
 class DatabaseInstaller:
     def __init__(self):
         self.host = "localhost"
@@ -19,15 +85,28 @@ class DatabaseInstaller:
         self.password = ""  # Contraseña de tu MySQL en XAMPP (por defecto vacía)
         self.database_name = "finanzas_personales"
         self.connection = None
+        self.app = None
         
     def crear_conexion_inicial(self):
         """Conecta a MySQL sin especificar base de datos"""
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password
-            )
+            try:
+                # Extensión en C del conector: parsea los result sets
+                # varias veces más rápido que la implementación pura
+                self.connection = mysql.connector.connect(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    use_pure=False
+                )
+            except ImportError:
+                # Sin libmysqlclient instalada: caer a Python puro
+                self.connection = mysql.connector.connect(
+                    host=self.host,
+                    user=self.user,
+                    password=self.password,
+                    use_pure=True
+                )
             if self.connection.is_connected():
                 print("✅ Conexión a MySQL exitosa")
                 return True
@@ -45,41 +124,50 @@ class DatabaseInstaller:
             cursor = self.connection.cursor()
             cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
             print(f"✅ Base de datos '{self.database_name}' creada")
+
+            # Cambiar de base de datos sobre la misma conexión (un
+            # COM_INIT_DB) en lugar de cerrar y rehacer handshake + auth
+            cursor.execute(f"USE `{self.database_name}`")
             cursor.close()
-            
-            # Reconectar con la base de datos específica
-            self.connection.close()
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database_name
-            )
             return True
         except Error as e:
             print(f"❌ Error al crear base de datos: {e}")
             return False
     
+    def obtener_app(self):
+        """
+        Crea la aplicación Flask una sola vez y la reutiliza
+
+        El factory paga registro de modelos, extensiones y engine; los
+        pasos de instalación comparten una sola instancia (y por tanto
+        el mismo pool de conexiones).
+        """
+        if self.app is None:
+            from app import create_app
+            self.app = create_app('development')
+        return self.app
+
     def crear_tablas_con_sqlalchemy(self):
         """Crea las tablas usando SQLAlchemy"""
         try:
             print("📋 Creando tablas con SQLAlchemy...")
             
-            from app import create_app, db
-            
-            app = create_app('development')
-            
+            from app import db
+
+            app = self.obtener_app()
+
             with app.app_context():
                 # Importar todos los modelos
                 from app.models import (
                     Usuario, ConfiguracionUsuario, Categoria, Cuenta,
                     Transaccion, Presupuesto, MetaAhorro, AporteMeta,
-                    ConsejoFinanciero, Sesion, LogActividad, EstadisticaApp
+                    SaldoMensual, ConsejoFinanciero, Sesion, LogActividad,
+                    EstadisticaApp
                 )
                 
-                # Crear todas las tablas
-                db.create_all()
-                
+                # Crear todas las tablas (niveles independientes en paralelo)
+                crear_tablas_en_paralelo(db)
+
                 print("✅ Todas las tablas creadas exitosamente")
                 return True
                 
@@ -94,54 +182,43 @@ class DatabaseInstaller:
         try:
             print("📝 Insertando datos iniciales...")
             
-            from app import create_app, db
+            from app import db
             from app.models.categoria import Categoria
             from app.models.usuario import Usuario, ConfiguracionUsuario
-            
-            app = create_app('development')
-            
+
+            app = self.obtener_app()
+
             with app.app_context():
-                # Verificar si ya hay categorías
-                count = Categoria.query.count()
-                
-                if count == 0:
+                # Verificar si ya hay categorías (LIMIT 1 en lugar de
+                # COUNT: el servidor corta en la primera fila)
+                hay_categorias = db.session.query(Categoria.id).first() is not None
+
+                if not hay_categorias:
                     print("  ⏳ Insertando categorías predefinidas...")
-                    
-                    # Categorías de egresos
-                    categorias_egresos = [
-                        Categoria(nombre='Alimentación', tipo='egreso', color='#e74c3c', icono='fa-utensils'),
-                        Categoria(nombre='Transporte', tipo='egreso', color='#3498db', icono='fa-car'),
-                        Categoria(nombre='Vivienda', tipo='egreso', color='#9b59b6', icono='fa-home'),
-                        Categoria(nombre='Servicios', tipo='egreso', color='#f39c12', icono='fa-bolt'),
-                        Categoria(nombre='Salud', tipo='egreso', color='#1abc9c', icono='fa-heartbeat'),
-                        Categoria(nombre='Educación', tipo='egreso', color='#2ecc71', icono='fa-graduation-cap'),
-                        Categoria(nombre='Entretenimiento', tipo='egreso', color='#e67e22', icono='fa-gamepad'),
-                        Categoria(nombre='Ropa', tipo='egreso', color='#95a5a6', icono='fa-tshirt'),
-                        Categoria(nombre='Tecnología', tipo='egreso', color='#34495e', icono='fa-laptop'),
-                        Categoria(nombre='Otros Gastos', tipo='egreso', color='#7f8c8d', icono='fa-ellipsis-h'),
-                    ]
-                    
-                    # Categorías de ingresos
-                    categorias_ingresos = [
-                        Categoria(nombre='Salario', tipo='ingreso', color='#27ae60', icono='fa-money-bill-wave'),
-                        Categoria(nombre='Freelance', tipo='ingreso', color='#16a085', icono='fa-briefcase'),
-                        Categoria(nombre='Inversiones', tipo='ingreso', color='#2980b9', icono='fa-chart-line'),
-                        Categoria(nombre='Bonos', tipo='ingreso', color='#8e44ad', icono='fa-gift'),
-                        Categoria(nombre='Otros Ingresos', tipo='ingreso', color='#95a5a6', icono='fa-plus-circle'),
+
+                    categorias = [
+                        {'nombre': nombre, 'tipo': tipo, 'color': color, 'icono': icono}
+                        for nombre, tipo, color, icono in _CATEGORIAS_SEMILLA
                     ]
-                    
-                    for cat in categorias_egresos + categorias_ingresos:
-                        db.session.add(cat)
-                    
+
+                    # insert() de Core con lista de diccionarios: con
+                    # insertmanyvalues MySQL recibe un único
+                    # INSERT ... VALUES (...),(...) multi-fila (un solo
+                    # round-trip) en lugar de 15 sentencias; no_autoflush
+                    # evita el barrido de la sesión antes de ejecutar
+                    with db.session.no_autoflush:
+                        db.session.execute(Categoria.__table__.insert(), categorias)
                     db.session.commit()
                     print("  ✓ Categorías predefinidas insertadas")
                 else:
                     print("  ℹ️ Categorías ya existen")
                 
                 # Verificar si ya existe usuario admin
-                admin_count = Usuario.query.filter_by(rol='admin').count()
-                
-                if admin_count == 0:
+                hay_admin = db.session.query(Usuario.id).filter_by(
+                    rol='admin'
+                ).first() is not None
+
+                if not hay_admin:
                     print("  ⏳ Creando usuario administrador...")
                     
                     # Crear usuario administrador
@@ -152,10 +229,13 @@ class DatabaseInstaller:
                         moneda_preferida='COP'
                     )
                     admin.set_password('Admin123!')
-                    
+
+                    # flush obtiene admin.id sin cerrar la transacción:
+                    # usuario y configuración se confirman en un solo
+                    # commit (un solo fsync) en lugar de dos
                     db.session.add(admin)
-                    db.session.commit()
-                    
+                    db.session.flush()
+
                     # Crear configuración para el admin
                     config_admin = ConfiguracionUsuario(
                         usuario_id=admin.id,
@@ -182,18 +262,43 @@ class DatabaseInstaller:
             traceback.print_exc()
             return False
     
-    def verificar_instalacion(self):
-        """Verifica que todas las tablas se hayan creado correctamente"""
+    def verificar_instalacion(self, verbose=False):
+        """
+        Verifica que todas las tablas se hayan creado correctamente
+
+        Args:
+            verbose (bool): Si es True, lista cada tabla; por defecto
+                solo viaja un COUNT(*) por la red
+        """
         try:
             cursor = self.connection.cursor()
-            cursor.execute("SHOW TABLES")
+
+            if not verbose:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM information_schema.tables "
+                    "WHERE table_schema = %s",
+                    (self.database_name,)
+                )
+                total = cursor.fetchone()[0]
+                cursor.close()
+
+                print(f"\n✅ Total de tablas: {total}")
+                return True
+
+            # information_schema en lugar de SHOW TABLES: una consulta
+            # indexada sin el metadata lock que SHOW TABLES adquiere
+            cursor.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = %s ORDER BY table_name",
+                (self.database_name,)
+            )
             tables = cursor.fetchall()
             cursor.close()
-            
-            print("\n📊 Tablas creadas en la base de datos:")
-            for table in tables:
-                print(f"   • {table[0]}")
-            
+
+            # Un solo print (un write a stdout) en lugar de uno por tabla
+            listado = "\n".join(f"   • {table[0]}" for table in tables)
+            print(f"\n📊 Tablas creadas en la base de datos:\n{listado}")
+
             print(f"\n✅ Total de tablas: {len(tables)}")
             return True
             